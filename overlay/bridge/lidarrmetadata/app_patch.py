@@ -46,6 +46,9 @@ def apply() -> None:
     from lidarrmetadata import util
     from lidarrmetadata import release_filters
     if mitm.is_enabled():
+        # Resolve hook modules now so the first request does not pay for the import.
+        mitm.warmup()
+
         @upstream_app.app.after_request
         async def _limbo_mitm_hook(response):
             return await mitm.apply_response(response)
@@ -101,6 +104,8 @@ def apply() -> None:
     if db_hooks.is_enabled():
         from lidarrmetadata import provider as provider_mod
 
+        db_hooks.warmup()
+
         original_query_from_file = provider_mod.MusicbrainzDbProvider.query_from_file
         if not getattr(original_query_from_file, "_limbo_sql_file_hooked", False):
 
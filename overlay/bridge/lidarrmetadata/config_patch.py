@@ -4,7 +4,7 @@ import os
 import socket
 from urllib.parse import urlparse
 from pathlib import Path
-from typing import Any, Dict, Optional, List, Tuple
+from typing import Any, Dict, Optional, List, Set, Tuple
 import base64
 
 import aiohttp
@@ -29,7 +29,11 @@ _LIDARR_CONFIG_PATH = "/api/v1/config/metadataprovider"
 _LIDARR_WARMUP_MID = "88f69eab-8f07-343b-847c-b944ad33dfcf"
 _LIDARR_WARMED = False
 _LIDARR_WARM_LOCK = asyncio.Lock()
+_PREWARM_TASKS: Set["asyncio.Task"] = set()
 _PROVIDER_TEST_MBID = "88f69eab-8f07-343b-847c-b944ad33dfcf"
+# Parsed release-filter state; refreshed only when _persist_config writes.
+_STATE_CACHE: Optional[Dict[str, Any]] = None
+_STATE_CACHE_LOADED = False
 
 
 def _as_bool(value: object) -> bool:
@@ -109,10 +113,11 @@ async def _probe_slskd_connection(base_url: str, api_key: str) -> Tuple[bool, st
         "/api/v1/system/status",
     )
     timeout = aiohttp.ClientTimeout(total=3)
+    root_url = base_url.rstrip("/")
     try:
         async with aiohttp.ClientSession(timeout=timeout) as session:
             for path in candidates:
-                url = base_url.rstrip("/") + path
+                url = root_url + path
                 async with session.get(url, headers=headers) as resp:
                     if resp.status in {401, 403}:
                         return False, "SLSKD API key is invalid.", ""
@@ -293,11 +298,44 @@ def _is_provider_enabled(provider_id: str) -> bool:
     return False
 
 
+async def _prewarm_lidarr() -> None:
+    global _LIDARR_WARMED
+    base_url = root_patch.get_lidarr_base_url()
+    api_key = root_patch.get_lidarr_api_key()
+    if not base_url or not api_key:
+        return
+    async with _LIDARR_WARM_LOCK:
+        if _LIDARR_WARMED:
+            return
+        warm_url = base_url.rstrip("/") + "/api/v1/album"
+        try:
+            timeout = aiohttp.ClientTimeout(total=4)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.get(
+                    warm_url,
+                    headers={"X-Api-Key": api_key},
+                    params={"foreignAlbumId": _LIDARR_WARMUP_MID},
+                ) as resp:
+                    if resp.status == 200:
+                        _LIDARR_WARMED = True
+        except Exception:
+            return
+
+
 def register_config_routes() -> None:
     existing_rules = {rule.rule for rule in upstream_app.app.url_map.iter_rules()}
 
     _load_persisted_config()
 
+    if not upstream_app.app.config.get("LIMBO_PREWARM_REGISTERED"):
+        upstream_app.app.config["LIMBO_PREWARM_REGISTERED"] = True
+
+        @upstream_app.app.before_serving
+        async def _limbo_prewarm_lidarr():
+            task = asyncio.create_task(_prewarm_lidarr())
+            _PREWARM_TASKS.add(task)
+            task.add_done_callback(_PREWARM_TASKS.discard)
+
     if "/config/lidarr-test" not in existing_rules:
         @upstream_app.app.route("/config/lidarr-test", methods=["POST"])
         async def _limbo_lidarr_test():
@@ -800,14 +838,15 @@ def register_config_routes() -> None:
                 return jsonify(data)
             payload = await request.get_json(silent=True) or {}
             enabled = _is_truthy(payload.get("enabled", True))
-            lidarr_base_url, base_url_provided = _extract_lidarr_base_url(payload)
+            fields = _normalize_payload_fields(payload)
+            lidarr_base_url, base_url_provided = _extract_lidarr_base_url(fields)
             if base_url_provided and _is_localhost_url(lidarr_base_url):
                 base_url_provided = False
                 lidarr_base_url = None
-            lidarr_url_base = _extract_lidarr_url_base(payload)
-            lidarr_port = _extract_lidarr_port(payload)
-            lidarr_use_ssl = _extract_lidarr_use_ssl(payload)
-            lidarr_api_key, api_key_provided = _extract_lidarr_api_key(payload)
+            lidarr_url_base = _extract_lidarr_url_base(fields)
+            lidarr_port = _extract_lidarr_port(fields)
+            lidarr_use_ssl = _extract_lidarr_use_ssl(fields)
+            lidarr_api_key, api_key_provided = _extract_lidarr_api_key(fields)
             lidarr_client_ip = None
             exclude = payload.get("exclude_media_formats")
             if exclude is None:
@@ -845,8 +884,8 @@ def register_config_routes() -> None:
                     "include_media_formats": release_filters.get_runtime_media_include() or [],
                     "keep_only_media_count": release_filters.get_runtime_media_keep_only(),
                     "prefer": release_filters.get_runtime_media_prefer(),
-                    "lidarr_version": _extract_lidarr_version(payload),
-                    "plugin_version": _extract_plugin_version(payload),
+                    "lidarr_version": _extract_lidarr_version(fields),
+                    "plugin_version": _extract_plugin_version(fields),
                     "lidarr_base_url": lidarr_base_url if base_url_provided else None,
                     "lidarr_api_key": lidarr_api_key if api_key_provided else None,
                     "lidarr_client_ip": lidarr_client_ip,
@@ -963,15 +1002,19 @@ def register_config_routes() -> None:
                 return jsonify({"ok": False, "error": "Missing Lidarr base URL or API key."}), 400
 
             resolved_ids: List[int] = []
-            resolved_artist_ids: List[int] = []
+            resolved_artist_ids: Set[int] = set()
             missing_mbids: List[str] = []
             errors: List[str] = []
             timeout = aiohttp.ClientTimeout(total=5)
             headers = {"X-Api-Key": api_key}
+            api_url = base_url.rstrip("/") + "/api/v1"
+            album_url = api_url + "/album"
+            artist_url = api_url + "/artist"
+            cmd_url = api_url + "/command"
 
             async with aiohttp.ClientSession(timeout=timeout) as session:
                 for mbid in mbids:
-                    album_id_url = base_url.rstrip("/") + f"/api/v1/album/{mbid}"
+                    album_id_url = f"{album_url}/{mbid}"
                     try:
                         async with session.get(album_id_url, headers=headers) as resp:
                             if resp.status == 200:
@@ -984,9 +1027,8 @@ def register_config_routes() -> None:
                                 errors.append(f"MBID {mbid}: status {resp.status}")
                     except Exception as exc:
                         errors.append(f"MBID {mbid}: {exc}")
-                    url = base_url.rstrip("/") + "/api/v1/album"
                     try:
-                        async with session.get(url, headers=headers, params={"foreignAlbumId": mbid}) as resp:
+                        async with session.get(album_url, headers=headers, params={"foreignAlbumId": mbid}) as resp:
                             if resp.status != 200:
                                 errors.append(f"MBID {mbid}: status {resp.status}")
                                 continue
@@ -995,13 +1037,9 @@ def register_config_routes() -> None:
                         errors.append(f"MBID {mbid}: {exc}")
                         continue
                     if data:
-                        for item in data:
-                            album_id = item.get("id")
-                            if isinstance(album_id, int):
-                                resolved_ids.append(album_id)
+                        resolved_ids.extend(_collect_ids(data))
                         continue
 
-                    artist_url = base_url.rstrip("/") + "/api/v1/artist"
                     try:
                         async with session.get(artist_url, headers=headers, params={"mbId": mbid}) as resp:
                             if resp.status != 200:
@@ -1014,16 +1052,13 @@ def register_config_routes() -> None:
                     if not artist_data:
                         missing_mbids.append(mbid)
                         continue
-                    for artist in artist_data:
-                        artist_id = artist.get("id")
-                        if isinstance(artist_id, int):
-                            resolved_artist_ids.append(artist_id)
+                    resolved_artist_ids.update(_collect_ids(artist_data))
 
-                artist_ids_unique = sorted(set(resolved_artist_ids))
+                artist_ids_unique = sorted(resolved_artist_ids)
                 for artist_id in artist_ids_unique:
                     try:
                         async with session.get(
-                            base_url.rstrip("/") + "/api/v1/album",
+                            album_url,
                             headers=headers,
                             params={"artistId": artist_id},
                         ) as resp:
@@ -1034,16 +1069,12 @@ def register_config_routes() -> None:
                     except Exception as exc:
                         errors.append(f"Artist {artist_id}: {exc}")
                         continue
-                    for item in albums or []:
-                        album_id = item.get("id")
-                        if isinstance(album_id, int):
-                            resolved_ids.append(album_id)
+                    resolved_ids.extend(_collect_ids(albums))
 
-                all_ids = sorted(set(lidarr_ids + resolved_ids))
+                all_ids = sorted({*lidarr_ids, *resolved_ids})
                 queued: List[int] = []
                 for album_id in all_ids:
                     try:
-                        cmd_url = base_url.rstrip("/") + "/api/v1/command"
                         command_payload: Dict[str, Any] = {
                             "name": "RefreshAlbum",
                             "albumId": album_id,
@@ -1093,15 +1124,20 @@ def register_config_routes() -> None:
                 return jsonify({"ok": False, "error": "Missing Lidarr base URL or API key."}), 400
 
             errors: List[str] = []
+            artist_id_set: Set[int] = set()
+            album_id_set: Set[int] = set()
             artist_ids: List[int] = []
             album_ids: List[int] = []
             queued: List[int] = []
             queued_kind = "artist"
             timeout = aiohttp.ClientTimeout(total=60)
             headers = {"X-Api-Key": api_key}
+            api_url = base_url.rstrip("/") + "/api/v1"
+            artists_url = api_url + "/artist"
+            album_url = api_url + "/album"
+            cmd_url = api_url + "/command"
 
             async with aiohttp.ClientSession(timeout=timeout) as session:
-                artists_url = base_url.rstrip("/") + "/api/v1/artist"
                 try:
                     async with session.get(artists_url, headers=headers) as resp:
                         if resp.status != 200:
@@ -1126,13 +1162,9 @@ def register_config_routes() -> None:
                         502,
                     )
 
-                for artist in artists or []:
-                    artist_id = artist.get("id")
-                    if isinstance(artist_id, int):
-                        artist_ids.append(artist_id)
+                artist_id_set.update(_collect_ids(artists))
 
-                artist_ids = sorted(set(artist_ids))
-                cmd_url = base_url.rstrip("/") + "/api/v1/command"
+                artist_ids = sorted(artist_id_set)
 
                 if any_release_ok is None:
                     for artist_id in artist_ids:
@@ -1150,7 +1182,7 @@ def register_config_routes() -> None:
                     for artist_id in artist_ids:
                         try:
                             async with session.get(
-                                base_url.rstrip("/") + "/api/v1/album",
+                                album_url,
                                 headers=headers,
                                 params={"artistId": artist_id},
                             ) as resp:
@@ -1162,12 +1194,9 @@ def register_config_routes() -> None:
                             errors.append(f"Artist {artist_id}: album lookup {exc}")
                             continue
 
-                        for item in albums or []:
-                            album_id = item.get("id")
-                            if isinstance(album_id, int):
-                                album_ids.append(album_id)
+                        album_id_set.update(_collect_ids(albums))
 
-                    album_ids = sorted(set(album_ids))
+                    album_ids = sorted(album_id_set)
                     for album_id in album_ids:
                         try:
                             command_payload: Dict[str, Any] = {
@@ -1239,12 +1268,12 @@ def register_config_routes() -> None:
             if not base_url or not api_key:
                 return jsonify({"ok": False, "error": "Missing Lidarr base URL or API key."}), 400
 
-            mbid_valid: List[str] = []
-            mbid_artist_valid: List[str] = []
-            mbid_album_valid: List[str] = []
-            mbid_invalid: List[str] = []
-            lidarr_valid: List[int] = []
-            lidarr_invalid: List[int] = []
+            mbid_valid: Set[str] = set()
+            mbid_artist_valid: Set[str] = set()
+            mbid_album_valid: Set[str] = set()
+            mbid_invalid: Set[str] = set()
+            lidarr_valid: Set[int] = set()
+            lidarr_invalid: Set[int] = set()
             errors: List[str] = []
             timeout = aiohttp.ClientTimeout(total=4)
             headers = {"X-Api-Key": api_key}
@@ -1253,8 +1282,9 @@ def register_config_routes() -> None:
             async with aiohttp.ClientSession(timeout=timeout) as session:
                 await _warm_lidarr(base_url, api_key, session)
                 semaphore = asyncio.Semaphore(4)
-                artist_url = base_url.rstrip("/") + "/api/v1/artist"
-                album_url = base_url.rstrip("/") + "/api/v1/album"
+                api_url = base_url.rstrip("/") + "/api/v1"
+                artist_url = api_url + "/artist"
+                album_url = api_url + "/album"
 
                 async def validate_mbid(mbid: str) -> None:
                     async with semaphore:
@@ -1307,28 +1337,28 @@ def register_config_routes() -> None:
                                 check_artist(), check_album()
                             )
                             if artist_ok:
-                                mbid_valid.append(mbid)
-                                mbid_artist_valid.append(mbid)
+                                mbid_valid.add(mbid)
+                                mbid_artist_valid.add(mbid)
                                 add_debug("  -> valid (artist/search)")
                                 return
                             if album_ok:
-                                mbid_valid.append(mbid)
-                                mbid_album_valid.append(mbid)
+                                mbid_valid.add(mbid)
+                                mbid_album_valid.add(mbid)
                                 add_debug("  -> valid (album/search)")
                                 return
                         else:
                             if await check_artist():
-                                mbid_valid.append(mbid)
-                                mbid_artist_valid.append(mbid)
+                                mbid_valid.add(mbid)
+                                mbid_artist_valid.add(mbid)
                                 add_debug("  -> valid (artist/search)")
                                 return
                             if await check_album():
-                                mbid_valid.append(mbid)
-                                mbid_album_valid.append(mbid)
+                                mbid_valid.add(mbid)
+                                mbid_album_valid.add(mbid)
                                 add_debug("  -> valid (album/search)")
                                 return
 
-                        mbid_invalid.append(mbid)
+                        mbid_invalid.add(mbid)
                         add_debug("  -> invalid")
 
                 await asyncio.gather(*(validate_mbid(mbid) for mbid in mbids))
@@ -1336,13 +1366,13 @@ def register_config_routes() -> None:
                 for lidarr_id in lidarr_ids:
                     try:
                         async with session.get(
-                            base_url.rstrip("/") + f"/api/v1/album/{lidarr_id}",
+                            f"{album_url}/{lidarr_id}",
                             headers=headers,
                         ) as resp:
                             if resp.status == 200:
-                                lidarr_valid.append(lidarr_id)
+                                lidarr_valid.add(lidarr_id)
                             elif resp.status == 404:
-                                lidarr_invalid.append(lidarr_id)
+                                lidarr_invalid.add(lidarr_id)
                             else:
                                 errors.append(f"Lidarr ID {lidarr_id}: status {resp.status}")
                     except Exception as exc:
@@ -1353,12 +1383,12 @@ def register_config_routes() -> None:
             return jsonify(
                 {
                     "ok": True,
-                    "mbid_valid": sorted(set(mbid_valid)),
-                    "mbid_artist_valid": sorted(set(mbid_artist_valid)),
-                    "mbid_album_valid": sorted(set(mbid_album_valid)),
-                    "mbid_invalid": sorted(set(mbid_invalid)),
-                    "lidarr_valid": sorted(set(lidarr_valid)),
-                    "lidarr_invalid": sorted(set(lidarr_invalid)),
+                    "mbid_valid": sorted(mbid_valid),
+                    "mbid_artist_valid": sorted(mbid_artist_valid),
+                    "mbid_album_valid": sorted(mbid_album_valid),
+                    "mbid_invalid": sorted(mbid_invalid),
+                    "lidarr_valid": sorted(lidarr_valid),
+                    "lidarr_invalid": sorted(lidarr_invalid),
                     "errors": errors,
                     **({"debug": debug_lines} if debug_enabled else {}),
                 }
@@ -1418,36 +1448,13 @@ def _resolve_limbo_referrer_url() -> Tuple[str, str]:
 
 
 def _resolve_limbo_host_url(_lidarr_base_url: str) -> Tuple[str, str]:
-    gateway_ip, error = _get_default_gateway_ip()
+    gateway_ip, error = root_patch.get_default_gateway_ip()
     if not gateway_ip:
         return "", error or "Unable to determine host IP."
     limbo_port = os.getenv("LIMBO_PORT", "").strip() or "5001"
     return f"http://{gateway_ip}:{limbo_port}", ""
 
 
-def _get_default_gateway_ip() -> Tuple[str, str]:
-    try:
-        with open("/proc/net/route", "r", encoding="utf-8") as fh:
-            for line in fh:
-                fields = line.strip().split()
-                if len(fields) < 3:
-                    continue
-                iface, dest, gateway = fields[0], fields[1], fields[2]
-                if iface == "Iface" or dest != "00000000":
-                    continue
-                try:
-                    gateway_ip = socket.inet_ntoa(
-                        int(gateway, 16).to_bytes(4, "little")
-                    )
-                except Exception:
-                    continue
-                if gateway_ip and gateway_ip != "0.0.0.0":
-                    return gateway_ip, ""
-    except Exception as exc:
-        return "", f"Unable to read gateway: {exc}"
-    return "", "Default gateway not found."
-
-
 def _resolve_limbo_url_by_mode(
     lidarr_base_url: str, mode: str, custom_url: str
 ) -> Tuple[str, str]:
@@ -1469,13 +1476,12 @@ def _is_musicbrainz_url(value: str) -> bool:
     text = str(value or "").strip().lower()
     if not text:
         return False
-    if not text.startswith("http://") and not text.startswith("https://"):
-        text = "http://" + text
-    try:
-        parsed = urlparse(text)
-    except Exception:
-        return False
-    host = (parsed.hostname or "").lower()
+    _scheme, sep, rest = text.partition("://")
+    if not sep:
+        rest = text
+    for delim in "/?#":
+        rest = rest.split(delim, 1)[0]
+    host = rest.rpartition("@")[2].split(":", 1)[0]
     return host == "musicbrainz.org" or host.endswith(".musicbrainz.org")
 
 
@@ -1554,105 +1560,106 @@ def _prefer_value_to_token(value: object) -> Optional[str]:
     return None
 
 
-def _extract_lidarr_version(payload: Dict[str, Any]) -> str:
-    value = payload.get("lidarr_version")
-    if value is None:
-        value = payload.get("lidarrVersion")
-    if value is None:
-        value = payload.get("lidarr_version_string")
-    if value is None:
-        value = payload.get("lidarrVersionString")
-    return str(value).strip() if value else ""
+_FIELD_ALIAS_GROUPS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    (
+        "lidarr_version",
+        ("lidarr_version", "lidarrVersion", "lidarr_version_string", "lidarrVersionString"),
+    ),
+    (
+        "plugin_version",
+        (
+            "plugin_version",
+            "pluginVersion",
+            "limbo_plugin_version",
+            "limboPluginVersion",
+            "limbo_version",
+            "limboVersion",
+        ),
+    ),
+    (
+        "lidarr_base_url",
+        ("lidarr_base_url", "lidarrBaseUrl", "lidarr_url", "lidarrUrl", "base_url", "baseUrl"),
+    ),
+    (
+        "lidarr_api_key",
+        ("lidarr_api_key", "lidarrApiKey", "api_key", "apiKey", "lidarr_key", "lidarrKey"),
+    ),
+    ("lidarr_port", ("lidarr_port", "lidarrPort", "port")),
+    ("lidarr_ssl", ("lidarr_ssl", "lidarrSsl", "use_ssl", "useSsl", "ssl")),
+    ("lidarr_url_base", ("lidarr_url_base", "lidarrUrlBase", "url_base", "urlBase")),
+)
+# alias -> (canonical key, priority); lower priority wins when several aliases are sent.
+_FIELD_ALIASES: Dict[str, Tuple[str, int]] = {
+    alias: (canonical, rank)
+    for canonical, aliases in _FIELD_ALIAS_GROUPS
+    for rank, alias in enumerate(aliases)
+}
+# Version fields fall through to the next alias when a value is null.
+_FIELD_SKIP_NONE = frozenset({"lidarr_version", "plugin_version"})
+
+
+def _normalize_payload_fields(payload: Dict[str, Any]) -> Dict[str, Any]:
+    best: Dict[str, Tuple[int, Any]] = {}
+    for key, value in payload.items():
+        alias = _FIELD_ALIASES.get(key)
+        if alias is None:
+            continue
+        canonical, rank = alias
+        if value is None and canonical in _FIELD_SKIP_NONE:
+            continue
+        current = best.get(canonical)
+        if current is None or rank < current[0]:
+            best[canonical] = (rank, value)
+    return {canonical: value for canonical, (_rank, value) in best.items()}
 
 
-def _extract_plugin_version(payload: Dict[str, Any]) -> str:
-    value = payload.get("plugin_version")
-    if value is None:
-        value = payload.get("pluginVersion")
-    if value is None:
-        value = payload.get("limbo_plugin_version")
-    if value is None:
-        value = payload.get("limboPluginVersion")
-    if value is None:
-        value = payload.get("limbo_version")
-    if value is None:
-        value = payload.get("limboVersion")
+def _extract_lidarr_version(fields: Dict[str, Any]) -> str:
+    value = fields.get("lidarr_version")
     return str(value).strip() if value else ""
 
 
-def _extract_lidarr_base_url(payload: Dict[str, Any]) -> tuple[str, bool]:
-    for key in (
-        "lidarr_base_url",
-        "lidarrBaseUrl",
-        "lidarr_url",
-        "lidarrUrl",
-        "base_url",
-        "baseUrl",
-    ):
-        if key in payload:
-            value = payload.get(key)
-            return (str(value).strip() if value is not None else "", True)
-    return "", False
+def _extract_plugin_version(fields: Dict[str, Any]) -> str:
+    value = fields.get("plugin_version")
+    return str(value).strip() if value else ""
 
 
-def _is_localhost_url(value: Optional[str]) -> bool:
-    if not value:
-        return False
-    lowered = value.strip().lower()
-    if not lowered.startswith("http://") and not lowered.startswith("https://"):
-        lowered = "http://" + lowered
-    try:
-        from urllib.parse import urlparse
-
-        parsed = urlparse(lowered)
-        host = (parsed.hostname or "").lower()
-    except Exception:
-        return False
-    return host in {"localhost", "127.0.0.1", "::1"}
+def _extract_lidarr_base_url(fields: Dict[str, Any]) -> tuple[str, bool]:
+    if "lidarr_base_url" not in fields:
+        return "", False
+    value = fields["lidarr_base_url"]
+    return (str(value).strip() if value is not None else "", True)
 
 
-def _extract_lidarr_api_key(payload: Dict[str, Any]) -> tuple[str, bool]:
-    for key in (
-        "lidarr_api_key",
-        "lidarrApiKey",
-        "api_key",
-        "apiKey",
-        "lidarr_key",
-        "lidarrKey",
-    ):
-        if key in payload:
-            value = payload.get(key)
-            return (str(value).strip() if value is not None else "", True)
-    return "", False
+def _extract_lidarr_api_key(fields: Dict[str, Any]) -> tuple[str, bool]:
+    if "lidarr_api_key" not in fields:
+        return "", False
+    value = fields["lidarr_api_key"]
+    return (str(value).strip() if value is not None else "", True)
 
 
-def _extract_lidarr_port(payload: Dict[str, Any]) -> Optional[int]:
-    for key in ("lidarr_port", "lidarrPort", "port"):
-        if key in payload:
-            value = payload.get(key)
-            try:
-                return int(value)
-            except (TypeError, ValueError):
-                return None
-    return None
+def _extract_lidarr_port(fields: Dict[str, Any]) -> Optional[int]:
+    if "lidarr_port" not in fields:
+        return None
+    try:
+        return int(fields["lidarr_port"])
+    except (TypeError, ValueError):
+        return None
 
 
-def _extract_lidarr_use_ssl(payload: Dict[str, Any]) -> bool:
-    for key in ("lidarr_ssl", "lidarrSsl", "use_ssl", "useSsl", "ssl"):
-        if key in payload:
-            return _is_truthy(payload.get(key))
-    return False
+def _extract_lidarr_use_ssl(fields: Dict[str, Any]) -> bool:
+    if "lidarr_ssl" not in fields:
+        return False
+    return _is_truthy(fields["lidarr_ssl"])
 
 
-def _extract_lidarr_url_base(payload: Dict[str, Any]) -> str:
-    for key in ("lidarr_url_base", "lidarrUrlBase", "url_base", "urlBase"):
-        if key in payload:
-            value = payload.get(key)
-            text = str(value).strip() if value is not None else ""
-            if text and not text.startswith("/"):
-                text = "/" + text
-            return text
-    return ""
+def _extract_lidarr_url_base(fields: Dict[str, Any]) -> str:
+    if "lidarr_url_base" not in fields:
+        return ""
+    value = fields["lidarr_url_base"]
+    text = str(value).strip() if value is not None else ""
+    if text and not text.startswith("/"):
+        text = "/" + text
+    return text
 
 
 def _extract_client_ip(req) -> str:
@@ -1663,10 +1670,18 @@ def _extract_client_ip(req) -> str:
     return req.remote_addr or ""
 
 
+_LOCALHOST_URL_PREFIXES = (
+    "http://localhost",
+    "https://localhost",
+    "http://127.0.0.1",
+    "https://127.0.0.1",
+    "http://[::1]",
+    "https://[::1]",
+)
+
+
 def _is_localhost_url(value: str) -> bool:
-    text = (value or "").strip().lower()
-    return text.startswith("http://localhost") or text.startswith("https://localhost") or \
-        text.startswith("http://127.0.0.1") or text.startswith("https://127.0.0.1")
+    return (value or "").strip().lower().startswith(_LOCALHOST_URL_PREFIXES)
 
 
 def _parse_int_list(values) -> List[int]:
@@ -1685,6 +1700,15 @@ def _parse_int_list(values) -> List[int]:
     return out
 
 
+def _collect_ids(items: Any) -> List[int]:
+    ids: List[int] = []
+    for item in items or []:
+        item_id = item.get("id")
+        if isinstance(item_id, int):
+            ids.append(item_id)
+    return ids
+
+
 def _parse_mbid_list(values) -> List[str]:
     if values is None:
         return []
@@ -1698,10 +1722,22 @@ def _parse_mbid_list(values) -> List[str]:
     return out
 
 
-def _load_persisted_config() -> None:
+def _read_state_data() -> Optional[Dict[str, Any]]:
+    global _STATE_CACHE, _STATE_CACHE_LOADED
+    if _STATE_CACHE_LOADED:
+        return _STATE_CACHE
     try:
         data = json.loads(_STATE_FILE.read_text(encoding="utf-8"))
     except Exception:
+        data = None
+    _STATE_CACHE = data if isinstance(data, dict) else None
+    _STATE_CACHE_LOADED = True
+    return _STATE_CACHE
+
+
+def _load_persisted_config() -> None:
+    data = _read_state_data()
+    if data is None:
         return
 
     enabled = bool(data.get("enabled", True))
@@ -1722,9 +1758,8 @@ def _load_persisted_config() -> None:
 
 
 def _read_enabled_flag() -> bool:
-    try:
-        data = json.loads(_STATE_FILE.read_text(encoding="utf-8"))
-    except Exception:
+    data = _read_state_data()
+    if data is None:
         return True
     return bool(data.get("enabled", True))
 
@@ -1746,8 +1781,8 @@ def _read_enabled_flag() -> bool:
 
 
 def _persist_config(data: Dict[str, Any]) -> None:
+    global _STATE_CACHE, _STATE_CACHE_LOADED
     try:
-        _STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
         payload = {
             "enabled": bool(data.get("enabled", True)),
             "exclude_media_formats": data.get("exclude_media_formats") or [],
@@ -1772,6 +1807,12 @@ def _persist_config(data: Dict[str, Any]) -> None:
         if data.get("lidarr_client_ip") is not None:
             payload["lidarr_client_ip"] = str(data.get("lidarr_client_ip") or "").strip()
             root_patch.set_lidarr_client_ip(payload["lidarr_client_ip"])
-        _STATE_FILE.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        text = json.dumps(payload, indent=2, sort_keys=True) + "\n"
+        root_patch.write_in_state_dir(
+            _STATE_FILE.parent,
+            lambda: _STATE_FILE.write_text(text, encoding="utf-8"),
+        )
     except Exception:
         return
+    _STATE_CACHE = payload
+    _STATE_CACHE_LOADED = True
@@ -1,7 +1,9 @@
+import functools
 import importlib
 import importlib.util
 import logging
 import os
+import sys
 from typing import Any, Callable, Dict, Optional, Tuple
 
 import asyncio
@@ -17,6 +19,14 @@ _CUSTOM_BEFORE: Optional[Callable[[str, Tuple[Any, ...], Dict[str, Any]], Tuple[
 _CUSTOM_AFTER: Optional[Callable[[Any, Dict[str, Any]], Any]] = None
 _BUILTIN_LOAD_ATTEMPTED = False
 _CUSTOM_LOAD_ATTEMPTED = False
+_HOOKS_READY = False
+_BEFORE_HOOKS: Tuple[Callable[[str, Tuple[Any, ...], Dict[str, Any]], Tuple[str, Tuple[Any, ...]]], ...] = ()
+_AFTER_HOOKS: Tuple[Callable[[Any, Dict[str, Any]], Any], ...] = ()
+_BEFORE_NOOP = False
+_AFTER_NOOP = False
+_POOL_MIN_SIZE = 2
+_POOL_MAX_SIZE = 10
+_POOL_IDLE_TTL = 300.0
 _SQL_FILE = contextvars.ContextVar("limbo_sql_file", default=None)
 
 
@@ -30,11 +40,13 @@ def _load_builtin() -> None:
         return
     _BUILTIN_LOAD_ATTEMPTED = True
 
-    try:
-        module = importlib.import_module(_DEFAULT_HOOK_MODULE)
-    except Exception:
-        logger.exception("Limbo DB hooks: failed to import built-in module %s", _DEFAULT_HOOK_MODULE)
-        return
+    module = sys.modules.get(_DEFAULT_HOOK_MODULE)
+    if module is None:
+        try:
+            module = importlib.import_module(_DEFAULT_HOOK_MODULE)
+        except Exception:
+            logger.exception("Limbo DB hooks: failed to import built-in module %s", _DEFAULT_HOOK_MODULE)
+            return
 
     before = getattr(module, "before_query", None)
     after = getattr(module, "after_query", None)
@@ -117,6 +129,21 @@ def get_sql_file() -> Optional[str]:
     return _SQL_FILE.get()
 
 
+def _ensure_hooks_loaded() -> None:
+    global _HOOKS_READY, _BEFORE_HOOKS, _AFTER_HOOKS, _BEFORE_NOOP, _AFTER_NOOP
+    _load_builtin()
+    _load_custom()
+    _BEFORE_HOOKS = tuple(
+        hook for hook in (_BUILTIN_BEFORE, _CUSTOM_BEFORE) if hook is not None
+    )
+    _AFTER_HOOKS = tuple(
+        hook for hook in (_BUILTIN_AFTER, _CUSTOM_AFTER) if hook is not None
+    )
+    _BEFORE_NOOP = not _BEFORE_HOOKS
+    _AFTER_NOOP = not _AFTER_HOOKS
+    _HOOKS_READY = True
+
+
 def _apply_before_hook(
     hook: Optional[Callable[[str, Tuple[Any, ...], Dict[str, Any]], Tuple[str, Tuple[Any, ...]]]],
     sql: str,
@@ -156,20 +183,26 @@ def _apply_before_hook(
     return new_sql, new_args, new_pool_key
 
 
+def warmup() -> None:
+    if not _HOOKS_READY:
+        _ensure_hooks_loaded()
+
+
 def apply_before(
     sql: str, args: Tuple[Any, ...], context: Dict[str, Any]
 ) -> Tuple[str, Tuple[Any, ...], str]:
     if not is_enabled():
         return sql, args, "default"
-    _load_builtin()
-    _load_custom()
+    if not _HOOKS_READY:
+        _ensure_hooks_loaded()
+    if _BEFORE_NOOP:
+        return sql, args, "default"
 
-    current_sql, current_args, pool_key = _apply_before_hook(
-        _BUILTIN_BEFORE, sql, args, context, "default"
-    )
-    current_sql, current_args, pool_key = _apply_before_hook(
-        _CUSTOM_BEFORE, current_sql, current_args, context, pool_key
-    )
+    current_sql, current_args, pool_key = sql, args, "default"
+    for hook in _BEFORE_HOOKS:
+        current_sql, current_args, pool_key = _apply_before_hook(
+            hook, current_sql, current_args, context, pool_key
+        )
 
     return current_sql, current_args, pool_key
 
@@ -177,13 +210,13 @@ def apply_before(
 def apply_after(results: Any, context: Dict[str, Any]) -> Any:
     if not is_enabled():
         return results
-    _load_builtin()
-    _load_custom()
+    if not _HOOKS_READY:
+        _ensure_hooks_loaded()
+    if _AFTER_NOOP:
+        return results
 
     current = results
-    for hook in (_BUILTIN_AFTER, _CUSTOM_AFTER):
-        if hook is None:
-            continue
+    for hook in _AFTER_HOOKS:
         try:
             updated = hook(current, context)
         except Exception:
@@ -195,9 +228,27 @@ def apply_after(results: Any, context: Dict[str, Any]) -> Any:
     return current
 
 
+@functools.lru_cache(maxsize=None)
+def _pool_env_snapshot(pool_key: str) -> Dict[str, str]:
+    prefix = f"LIMBO_DB_POOL_{pool_key.upper()}_"
+    return {
+        name[len(prefix):]: value
+        for name, value in os.environ.items()
+        if name.startswith(prefix)
+    }
+
+
 def _pool_env(pool_key: str, suffix: str) -> Optional[str]:
-    key = pool_key.upper()
-    return os.environ.get(f"LIMBO_DB_POOL_{key}_{suffix}")
+    return _pool_env_snapshot(pool_key).get(suffix)
+
+
+def _int_env(value: Optional[str]) -> Optional[int]:
+    if value is None or not value.strip():
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
 
 
 async def get_pool(provider, pool_key: str):
@@ -208,15 +259,16 @@ async def get_pool(provider, pool_key: str):
     if pools is None:
         pools = {}
         provider._limbo_pools = pools
+    pool = pools.get(pool_key)
+    if pool is not None:
+        return pool
 
+    # No await between the lookup and the store, so concurrent first calls
+    # still end up sharing one lock per pool_key.
     locks = getattr(provider, "_limbo_pool_locks", None)
     if locks is None:
         locks = {}
         provider._limbo_pool_locks = locks
-
-    if pool_key in pools:
-        return pools[pool_key]
-
     lock = locks.get(pool_key)
     if lock is None:
         lock = asyncio.Lock()
@@ -239,6 +291,15 @@ async def get_pool(provider, pool_key: str):
             )
             return await provider._get_pool()
 
+        min_size = _int_env(_pool_env(pool_key, "MIN"))
+        if min_size is None or min_size < 0:
+            min_size = _POOL_MIN_SIZE
+        max_size = _int_env(_pool_env(pool_key, "MAX")) or _POOL_MAX_SIZE
+        idle_ttl = _int_env(_pool_env(pool_key, "IDLE_TTL"))
+        command_timeout = _int_env(_pool_env(pool_key, "COMMAND_TIMEOUT")) or None
+        if min_size > max_size:
+            min_size = max_size
+
         try:
             port_value = int(port) if port else provider._db_port
             pool = await asyncpg.create_pool(
@@ -249,6 +310,13 @@ async def get_pool(provider, pool_key: str):
                 database=db_name,
                 init=provider.uuid_as_str,
                 statement_cache_size=0,
+                min_size=min_size,
+                max_size=max_size,
+                max_inactive_connection_lifetime=float(
+                    idle_ttl if idle_ttl is not None else _POOL_IDLE_TTL
+                ),
+                command_timeout=command_timeout,
+                server_settings={"application_name": f"limbo:{pool_key}"},
             )
         except Exception:
             logger.exception("Limbo DB hooks: failed to create pool %s", pool_key)
@@ -3,15 +3,46 @@ import importlib.util
 import json
 import logging
 import os
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, FrozenSet, Optional
 
 from quart import request
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 _BUILTIN_TRANSFORM: Optional[Callable[[Any, Dict[str, Any]], Any]] = None
 _CUSTOM_TRANSFORM: Optional[Callable[[Any, Dict[str, Any]], Any]] = None
 _CUSTOM_LOAD_ATTEMPTED = False
+_ALL_CONTEXT_KEYS: FrozenSet[str] = frozenset(("path", "method", "query", "headers"))
+_CONTEXT_KEYS: Optional[FrozenSet[str]] = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _read_max_bytes() -> Optional[int]:
+    value = (os.environ.get("LIMBO_MITM_MAX_BYTES") or "").strip()
+    if not value:
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        logger.warning("Limbo MITM: ignoring invalid LIMBO_MITM_MAX_BYTES=%r", value)
+        return None
+    return limit if limit > 0 else None
+
+
+_MAX_BYTES = _read_max_bytes()
 
 
 def is_enabled() -> bool:
@@ -69,6 +100,27 @@ def _load_custom_transform() -> Optional[Callable[[Any, Dict[str, Any]], Any]]:
     return None
 
 
+def _context_keys(*transforms: Optional[Callable[[Any, Dict[str, Any]], Any]]) -> FrozenSet[str]:
+    global _CONTEXT_KEYS
+    if _CONTEXT_KEYS is not None:
+        return _CONTEXT_KEYS
+    keys = set()
+    for transform in transforms:
+        if transform is None:
+            continue
+        declared = getattr(transform, "__limbo_context_keys__", None)
+        if declared is None:
+            keys = set(_ALL_CONTEXT_KEYS)
+            break
+        keys.update(declared)
+    _CONTEXT_KEYS = frozenset(keys)
+    return _CONTEXT_KEYS
+
+
+def warmup() -> None:
+    _context_keys(_BUILTIN_TRANSFORM, _load_custom_transform())
+
+
 async def apply_response(response):
     if not is_enabled():
         return response
@@ -81,6 +133,11 @@ async def apply_response(response):
     if "application/json" not in content_type:
         return response
 
+    if _MAX_BYTES is not None:
+        content_length = response.content_length
+        if content_length is not None and content_length > _MAX_BYTES:
+            return response
+
     try:
         raw = await response.get_data()
     except Exception:
@@ -91,16 +148,16 @@ async def apply_response(response):
         return response
 
     try:
-        payload = json.loads(raw)
+        payload = _json_loads(raw)
     except Exception:
         return response
 
-    context = {
-        "path": request.path,
-        "method": request.method,
-        "query": dict(request.args),
-        "headers": {k: v for k, v in request.headers.items()},
-    }
+    needed = _context_keys(_BUILTIN_TRANSFORM, custom_transform)
+    context = {"path": request.path, "method": request.method}
+    if "query" in needed:
+        context["query"] = dict(request.args)
+    if "headers" in needed:
+        context["headers"] = dict(request.headers)
 
     current = payload
     for transform in (_BUILTIN_TRANSFORM, custom_transform):
@@ -118,7 +175,7 @@ async def apply_response(response):
         return response
 
     try:
-        response.set_data(json.dumps(current, separators=(",", ":")))
+        response.set_data(_json_dumps(current))
     except Exception:
         logger.exception("Limbo MITM: failed to update response body")
         return response
@@ -215,7 +215,7 @@ PROVIDER_CAPABILITIES: Dict[str, Dict[str, Any]] = {
 }
 
 
-def list_provider_capabilities() -> List[Dict[str, Any]]:
+def _build_provider_capabilities() -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
     for key in sorted(PROVIDER_CAPABILITIES):
         provider = PROVIDER_CAPABILITIES[key]
@@ -228,3 +228,10 @@ def list_provider_capabilities() -> List[Dict[str, Any]]:
             }
         )
     return items
+
+
+_PROVIDER_CAPABILITIES_LIST = _build_provider_capabilities()
+
+
+def list_provider_capabilities() -> List[Dict[str, Any]]:
+    return list(_PROVIDER_CAPABILITIES_LIST)
@@ -1,5 +1,12 @@
+import heapq
 import json
-from typing import Any, Dict, Iterable, List, Optional
+import re
+from typing import Any, Dict, Iterable, List, Optional, Pattern
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
 
 from lidarrmetadata.media_formats_meta import (
     ALIAS_MAP,
@@ -11,8 +18,23 @@ _RUNTIME_MEDIA_EXCLUDE: Optional[List[str]] = None
 _RUNTIME_MEDIA_INCLUDE: Optional[List[str]] = None
 _RUNTIME_MEDIA_KEEP_ONLY: Optional[int] = None
 _RUNTIME_MEDIA_PREFER: Optional[str] = None
+_RUNTIME_MEDIA_EXCLUDE_RE: Optional[Pattern[str]] = None
+_RUNTIME_MEDIA_INCLUDE_RE: Optional[Pattern[str]] = None
+_FILTERS_ACTIVE = False
 _ALIAS_MAP = ALIAS_MAP
 
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(value: Any) -> str:
+        return orjson.dumps(value).decode("utf-8")
+
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
 
 def _parse_list(value: Optional[str]) -> List[str]:
     if not value:
@@ -32,34 +54,42 @@ def _normalize_tokens(values: Iterable[str]) -> List[str]:
 
 
 def _expand_aliases(tokens: List[str]) -> List[str]:
-    expanded = []
+    expanded: List[str] = []
+    extend = expanded.extend
+    append = expanded.append
+    alias_get = _ALIAS_MAP.get
     for token in tokens:
-        mapped = _ALIAS_MAP.get(token)
+        mapped = alias_get(token)
         if mapped:
-            expanded.extend(mapped)
+            extend(mapped)
         else:
-            expanded.append(token)
+            append(token)
+    return list(dict.fromkeys(expanded))
+
+
+def _compile_tokens(tokens: Optional[List[str]]) -> Optional[Pattern[str]]:
+    if not tokens:
+        return None
+    return re.compile("|".join(map(re.escape, tokens)))
 
-    seen = set()
-    deduped = []
-    for token in expanded:
-        if token in seen:
-            continue
-        seen.add(token)
-        deduped.append(token)
-    return deduped
+
+def _recompute_active() -> None:
+    global _FILTERS_ACTIVE
+    _FILTERS_ACTIVE = bool(
+        _RUNTIME_MEDIA_INCLUDE or _RUNTIME_MEDIA_EXCLUDE or _RUNTIME_MEDIA_KEEP_ONLY
+    )
 
 
 def set_runtime_media_exclude(values: Optional[Iterable[str]]) -> None:
-    global _RUNTIME_MEDIA_EXCLUDE
+    global _RUNTIME_MEDIA_EXCLUDE, _RUNTIME_MEDIA_EXCLUDE_RE
     if values is None:
         _RUNTIME_MEDIA_EXCLUDE = None
-        return
-    if isinstance(values, str):
-        tokens = _parse_list(values)
+    elif isinstance(values, str):
+        _RUNTIME_MEDIA_EXCLUDE = _expand_aliases(_parse_list(values))
     else:
-        tokens = _normalize_tokens(values)
-    _RUNTIME_MEDIA_EXCLUDE = _expand_aliases(tokens)
+        _RUNTIME_MEDIA_EXCLUDE = _expand_aliases(_normalize_tokens(values))
+    _RUNTIME_MEDIA_EXCLUDE_RE = _compile_tokens(_RUNTIME_MEDIA_EXCLUDE)
+    _recompute_active()
 
 
 def get_runtime_media_exclude() -> Optional[List[str]]:
@@ -69,15 +99,15 @@ def get_runtime_media_exclude() -> Optional[List[str]]:
 
 
 def set_runtime_media_include(values: Optional[Iterable[str]]) -> None:
-    global _RUNTIME_MEDIA_INCLUDE
+    global _RUNTIME_MEDIA_INCLUDE, _RUNTIME_MEDIA_INCLUDE_RE
     if values is None:
         _RUNTIME_MEDIA_INCLUDE = None
-        return
-    if isinstance(values, str):
-        tokens = _parse_list(values)
+    elif isinstance(values, str):
+        _RUNTIME_MEDIA_INCLUDE = _expand_aliases(_parse_list(values))
     else:
-        tokens = _normalize_tokens(values)
-    _RUNTIME_MEDIA_INCLUDE = _expand_aliases(tokens)
+        _RUNTIME_MEDIA_INCLUDE = _expand_aliases(_normalize_tokens(values))
+    _RUNTIME_MEDIA_INCLUDE_RE = _compile_tokens(_RUNTIME_MEDIA_INCLUDE)
+    _recompute_active()
 
 
 def get_runtime_media_include() -> Optional[List[str]]:
@@ -89,10 +119,8 @@ def get_runtime_media_include() -> Optional[List[str]]:
 def set_runtime_media_keep_only(value: Optional[object]) -> None:
     global _RUNTIME_MEDIA_KEEP_ONLY
     count = _parse_int(value)
-    if count is None or count <= 0:
-        _RUNTIME_MEDIA_KEEP_ONLY = None
-        return
-    _RUNTIME_MEDIA_KEEP_ONLY = count
+    _RUNTIME_MEDIA_KEEP_ONLY = count if count is not None and count > 0 else None
+    _recompute_active()
 
 
 def get_runtime_media_keep_only() -> Optional[int]:
@@ -117,51 +145,32 @@ def get_runtime_media_prefer() -> Optional[str]:
 
 
 def _parse_int(value: Optional[object]) -> Optional[int]:
-    if value is None:
+    # int() already strips whitespace and rejects None/empty strings; floats
+    # are refused explicitly so they are not silently truncated.
+    if isinstance(value, float):
         return None
-    if isinstance(value, bool):
+    try:
         return int(value)
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str):
-        value = value.strip()
-        if not value:
-            return None
-        try:
-            return int(value)
-        except ValueError:
-            return None
-    return None
+    except (TypeError, ValueError):
+        return None
 
 
-def _release_formats(release: Dict[str, Any]) -> Iterable[str]:
+def _release_formats(release: Dict[str, Any]) -> List[str]:
     media_list = release.get("Media")
     if media_list is None:
         media_list = release.get("media")
-    for medium in media_list or []:
-        fmt = medium.get("Format") if isinstance(medium, dict) else None
-        if fmt:
-            yield str(fmt).lower()
+    return [
+        str(medium["Format"]).lower()
+        for medium in media_list or ()
+        if isinstance(medium, dict) and medium.get("Format")
+    ]
 
 
-def _has_excluded_format(release: Dict[str, Any], excluded_tokens: List[str]) -> bool:
-    if not excluded_tokens:
+def _has_matching_format(release: Dict[str, Any], pattern: Optional[Pattern[str]]) -> bool:
+    if pattern is None:
         return False
-    for fmt in _release_formats(release):
-        for token in excluded_tokens:
-            if token in fmt:
-                return True
-    return False
-
-
-def _has_included_format(release: Dict[str, Any], include_tokens: List[str]) -> bool:
-    if not include_tokens:
-        return False
-    for fmt in _release_formats(release):
-        for token in include_tokens:
-            if token in fmt:
-                return True
-    return False
+    search = pattern.search
+    return any(search(fmt) for fmt in _release_formats(release))
 
 
 def _priority_tokens() -> List[str]:
@@ -171,125 +180,121 @@ def _priority_tokens() -> List[str]:
     return list(PRIORITY_DIGITAL_FIRST)
 
 
-def _release_priority(release: Dict[str, Any], tokens: List[str]) -> int:
+def _release_priority(
+    formats: Iterable[str], tokens: List[str], ranks: Dict[str, int]
+) -> int:
     if not tokens:
         return 0
-    best = len(tokens) + 1
-    for fmt in _release_formats(release):
-        for idx, token in enumerate(tokens):
-            if token in fmt:
-                if idx < best:
-                    best = idx
+    unmatched = len(tokens) + 1
+    best = unmatched
+    for fmt in formats:
+        rank = ranks.get(fmt)
+        if rank is None:
+            rank = next(
+                (idx for idx, token in enumerate(tokens) if token in fmt), unmatched
+            )
+            ranks[fmt] = rank
+        if rank < best:
+            best = rank
     return best
 
 
 def _apply_release_filters_to_album(
     album: Dict[str, Any],
-    include_tokens: List[str],
-    excluded_tokens: List[str],
+    include_re: Optional[Pattern[str]],
+    exclude_re: Optional[Pattern[str]],
     keep_only_count: Optional[int],
 ) -> None:
-    releases = album.get("Releases") if isinstance(album, dict) else None
-    if releases is None and isinstance(album, dict):
-        releases = album.get("releases")
+    if not isinstance(album, dict):
+        return
+    rel_key = "Releases" if album.get("Releases") is not None else "releases"
+    releases = album.get(rel_key)
     if not isinstance(releases, list):
         return
 
-    if include_tokens:
+    if include_re is not None:
         filtered = [
             release for release in releases
-            if _has_included_format(release, include_tokens)
+            if _has_matching_format(release, include_re)
         ]
-        if "Releases" in album:
-            album["Releases"] = filtered
-        else:
-            album["releases"] = filtered
-    elif excluded_tokens:
+        album[rel_key] = filtered
+        releases = filtered
+    elif exclude_re is not None:
         filtered = [
             release for release in releases
-            if not _has_excluded_format(release, excluded_tokens)
+            if not _has_matching_format(release, exclude_re)
         ]
         if filtered:
-            if "Releases" in album:
-                album["Releases"] = filtered
-            else:
-                album["releases"] = filtered
+            album[rel_key] = filtered
+            releases = filtered
 
     if keep_only_count and keep_only_count > 0:
-        current = album.get("Releases") if isinstance(album, dict) else None
-        if current is None and isinstance(album, dict):
-            current = album.get("releases")
-        if isinstance(current, list) and len(current) > keep_only_count:
+        if len(releases) > keep_only_count:
             priority_tokens = _priority_tokens()
-            trimmed = sorted(
-                current,
-                key=lambda release: (
-                    _release_priority(release, priority_tokens),
-                    ",".join(sorted(_release_formats(release))),
-                ),
-            )[:keep_only_count]
-            if "Releases" in album:
-                album["Releases"] = trimmed
-            else:
-                album["releases"] = trimmed
+            # Albums repeat a handful of format strings across many releases,
+            # so each distinct format is ranked against the tokens only once.
+            format_ranks: Dict[str, int] = {}
+            decorated = []
+            for index, release in enumerate(releases):
+                formats = _release_formats(release)
+                decorated.append(
+                    (
+                        _release_priority(formats, priority_tokens, format_ranks),
+                        ",".join(sorted(formats)),
+                        index,
+                        release,
+                    )
+                )
+            # The index tiebreak keeps the selection stable and stops tuple
+            # comparison from ever reaching the release dicts.
+            trimmed = [
+                item[3] for item in heapq.nsmallest(keep_only_count, decorated)
+            ]
+            album[rel_key] = trimmed
 
 
 def apply_release_group_filters(release_group: Dict[str, Any]) -> Dict[str, Any]:
-    include_tokens = get_runtime_media_include() or []
-    excluded_tokens = get_runtime_media_exclude() or []
-    keep_only_count = get_runtime_media_keep_only()
-
-    if not include_tokens and not excluded_tokens and not keep_only_count:
+    if not _FILTERS_ACTIVE:
         return release_group
 
     if isinstance(release_group, dict):
         _apply_release_filters_to_album(
             release_group,
-            include_tokens,
-            excluded_tokens,
-            keep_only_count,
+            _RUNTIME_MEDIA_INCLUDE_RE,
+            _RUNTIME_MEDIA_EXCLUDE_RE,
+            _RUNTIME_MEDIA_KEEP_ONLY,
         )
     return release_group
 
 
 def after_query(results: Any, context: Dict[str, Any]) -> Any:
-    if context.get("sql_file") != "release_group_by_id.sql":
+    if not _FILTERS_ACTIVE or context.get("sql_file") != "release_group_by_id.sql":
         return None
 
-    include_tokens = get_runtime_media_include() or []
-    excluded_tokens = get_runtime_media_exclude() or []
-    keep_only_count = get_runtime_media_keep_only()
+    include_re = _RUNTIME_MEDIA_INCLUDE_RE
+    exclude_re = _RUNTIME_MEDIA_EXCLUDE_RE
+    keep_only_count = _RUNTIME_MEDIA_KEEP_ONLY
+    loads = _json_loads
+    dumps = _json_dumps
+    apply_filters = _apply_release_filters_to_album
 
-    if not include_tokens and not excluded_tokens and not keep_only_count:
-        return None
-
-    updated = []
-    for row in results or []:
+    def _process_row(row: Any) -> Any:
         album_json = row.get("album") if isinstance(row, dict) else None
         if not album_json:
-            updated.append(row)
-            continue
+            return row
 
         try:
-            album = json.loads(album_json) if isinstance(album_json, str) else album_json
+            album = loads(album_json) if isinstance(album_json, str) else album_json
         except Exception:
-            updated.append(row)
-            continue
+            return row
 
         if isinstance(album, dict):
-            _apply_release_filters_to_album(
-                album,
-                include_tokens,
-                excluded_tokens,
-                keep_only_count,
-            )
+            apply_filters(album, include_re, exclude_re, keep_only_count)
 
         try:
-            row["album"] = json.dumps(album, separators=(",", ":"))
+            row["album"] = dumps(album)
         except Exception:
-            updated.append(row)
-            continue
-
-        updated.append(row)
+            pass
+        return row
 
-    return updated
+    return [_process_row(row) for row in results or ()]
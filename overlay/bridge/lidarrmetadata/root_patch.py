@@ -1,27 +1,38 @@
+import functools
 import html
 import json
+import logging
 import os
-import secrets
+import hashlib
+import stat
 from pathlib import Path
 import re
 import time
 import asyncio
-import inspect
+import threading
+import itertools
 from datetime import datetime, timezone
-from typing import Optional, Tuple, Iterable, Dict, List
+from typing import Callable, Optional, Tuple, Iterable, Dict, List, Set
 
 try:
     import aiohttp
 except Exception:  # pragma: no cover - runtime dependency may be missing
     aiohttp = None
-import subprocess
-import socket
-from urllib.parse import urlparse
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
 import lidarrmetadata
-from lidarrmetadata import provider
-from lidarrmetadata.app import no_cache
 from lidarrmetadata.version_patch import _read_version
 
+if orjson is not None:
+    _json_loads = orjson.loads
+else:
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
 def _is_truthy(value: object) -> bool:
     if isinstance(value, str):
         return value.strip().lower() in {"1", "true", "yes", "on"}
@@ -34,6 +45,8 @@ def _limbo_channel_class() -> str:
     return "limbo-channel-stable"
 
 _START_TIME = time.time()
+# State directories already created by this process.
+_ENSURED_DIRS: Set[Path] = set()
 _STATE_DIR = Path(os.environ.get("LIMBO_INIT_STATE_DIR", "/metadata/init-state"))
 _LIDARR_VERSION_FILE = Path(
     os.environ.get(
@@ -42,6 +55,8 @@ _LIDARR_VERSION_FILE = Path(
     )
 )
 _LAST_LIDARR_VERSION: Optional[str] = None
+# Last value known to be in the file, so unchanged versions aren't rewritten.
+_LIDARR_VERSION_ON_DISK: Optional[str] = None
 _PLUGIN_VERSION_FILE = Path(
     os.environ.get(
         "LIMBO_PLUGIN_VERSION_FILE",
@@ -49,6 +64,7 @@ _PLUGIN_VERSION_FILE = Path(
     )
 )
 _LAST_PLUGIN_VERSION: Optional[str] = None
+_PLUGIN_VERSION_ON_DISK: Optional[str] = None
 _MBMS_VERSION_FILE = Path("/mbms/VERSION")
 _LIDARR_BASE_URL: Optional[str] = None
 _LIDARR_API_KEY: Optional[str] = None
@@ -100,8 +116,22 @@ _SERVICE_PRIORITY_ORDERS: Dict[str, List[str]] = {
     "albumart": [],
     "fanart": [],
 }
-_GITHUB_RELEASE_CACHE: Dict[str, Tuple[float, Optional[str]]] = {}
+# key -> (expires_at, version, tags_only); misses expire sooner than hits.
+# tags_only marks a repo whose /releases/latest 404'd, so the next lookup goes
+# straight to the tags endpoint; the one after that checks releases again.
+_GITHUB_RELEASE_CACHE: Dict[str, Tuple[float, Optional[str], bool]] = {}
 _GITHUB_RELEASE_CACHE_TTL = 300.0
+_GITHUB_RELEASE_NEG_TTL = 60.0
+# Lookups already in flight, so concurrent requests share one GitHub round trip.
+_GITHUB_INFLIGHT: Dict[str, "asyncio.Future"] = {}
+# Background refreshes started from the request path, held so they are not collected.
+_GITHUB_REFRESH_TASKS: Dict[str, "asyncio.Task"] = {}
+_RELEASE_REPOS = (("HVR88", "Limbo_Bridge"), ("HVR88", "MBMS_PLUS"))
+_GITHUB_SESSION: Optional["aiohttp.ClientSession"] = None
+# Shared by the Lidarr and MBMS admin calls; each request passes its own timeout.
+_HTTP_SESSION: Optional["aiohttp.ClientSession"] = None
+_GATEWAY_CACHE: Optional[Tuple[float, str, str]] = None
+_GATEWAY_CACHE_TTL = 60.0
 _REPLICATION_NOTIFY_FILE = Path(
     os.getenv(
         "LIMBO_REPLICATION_NOTIFY_FILE",
@@ -109,10 +139,32 @@ _REPLICATION_NOTIFY_FILE = Path(
     )
 )
 _LAST_REPLICATION_NOTIFY: Optional[dict] = None
+_LAST_REPLICATION_NOTIFY_MTIME: Optional[int] = None
+_REPLICATION_STATUS_FILE = Path(
+    os.getenv(
+        "LIMBO_REPLICATION_STATUS_FILE",
+        "/metadata/init-state/replication.pid",
+    )
+)
+# (checked_at, running, started); the UI polls /replication/status, so the
+# pid file is stat'ed at most once per TTL.
+_REPLICATION_STATUS_CACHE: Tuple[float, bool, str] = (0.0, False, "")
+_REPLICATION_STATUS_TTL = 1.0
+# (fetched_at, (use_remote, status_url), payload) shared by the root page and
+# /replication/status so a page load and its first poll cost one lookup.
+_REPLICATION_VIEW_CACHE: Optional[Tuple[float, Tuple[bool, str], object]] = None
 _THEME_FILE = Path(os.getenv("LIMBO_THEME_FILE", str(_STATE_DIR / "theme.txt")))
 _SETTINGS_FILE = Path(
     os.getenv("LIMBO_SETTINGS_FILE", str(_STATE_DIR / "limbo-settings.json"))
 )
+# Settings writes are coalesced: bursts of setter calls (e.g. saving the settings
+# page) schedule a single rewrite shortly after the first change.
+_PERSIST_DELAY = 0.05
+_PERSIST_LOCK = threading.Lock()
+_PERSIST_WRITE_LOCK = threading.Lock()
+_PERSIST_TIMER: Optional[threading.Timer] = None
+_LAST_PERSISTED_SETTINGS: Optional[dict] = None
+_SETTINGS_CACHE: Optional[Tuple[int, dict]] = None
 _LIDARR_FALLBACK_STATE_FILE = Path(
     os.getenv(
         "LIMBO_RELEASE_FILTER_STATE_FILE",
@@ -120,31 +172,275 @@ _LIDARR_FALLBACK_STATE_FILE = Path(
     )
 )
 
+_ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+# Inline assets are cached for the container lifetime; LIMBO_DEV re-reads them
+# on every root render so edits show up without a restart.
+_DEV_ASSETS = os.getenv("LIMBO_DEV", "").lower() in {"1", "true", "yes"}
+
+_VERSION_RE = re.compile(r"[vV]?([0-9]+(?:\.[0-9]+)*)")
+_XML_DECL_RE = re.compile(r"<\?xml[^>]*\?>", re.IGNORECASE)
+_XML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+
+
+def _escape_html(value: str) -> str:
+    # Most values (versions, URLs, keys) have nothing to escape. Plain substring
+    # tests beat both a regex guard and html.escape's replace chain on those;
+    # for the rest html.escape is still faster than str.translate.
+    if (
+        "&" in value
+        or "<" in value
+        or ">" in value
+        or '"' in value
+        or "'" in value
+    ):
+        return html.escape(value)
+    return value
+
 
 def _normalize_version_string(value: Optional[str]) -> str:
     if not value:
         return ""
     text = str(value).strip()
-    match = re.match(r"[vV]?([0-9]+(?:\.[0-9]+)*)", text)
+    match = _VERSION_RE.match(text)
     if not match:
         return text
     return match.group(1)
 
 
+@functools.lru_cache(maxsize=32)
 def _read_inline_svg(name: str) -> str:
-    assets_dir = Path(__file__).resolve().parent / "assets"
-    svg_path = assets_dir / name
+    svg_path = _ASSETS_DIR / name
     try:
-        content = svg_path.read_text(encoding="utf-8")
+        content = svg_path.read_bytes().decode("utf-8")
     except Exception:
         return ""
-    content = re.sub(r"<\?xml[^>]*\?>", "", content, flags=re.IGNORECASE).strip()
-    content = re.sub(r"<!--.*?-->", "", content, flags=re.DOTALL).strip()
+    content = _XML_DECL_RE.sub("", content).strip()
+    content = _XML_COMMENT_RE.sub("", content).strip()
     return content
 
 
-def _parse_version(value: str) -> Optional[Tuple[int, ...]]:
-    normalized = _normalize_version_string(value)
+@functools.lru_cache(maxsize=1)
+def _css_buster() -> str:
+    # Content hash, so browsers can keep root.css until it actually changes.
+    try:
+        return hashlib.sha1((_ASSETS_DIR / "root.css").read_bytes()).hexdigest()[:8]
+    except OSError:
+        return "0"
+
+
+# Unversioned asset URLs; short enough that an upgrade shows up within a day,
+# with the ETag letting browsers revalidate for a 304 in between.
+_ASSET_CACHE_CONTROL = "public, max-age=86400"
+# The root page changes with live status, so browsers keep it but always ask.
+_PAGE_CACHE_CONTROL = "no-cache, must-revalidate"
+
+
+@functools.lru_cache(maxsize=16)
+def _read_static_asset(name: str) -> Tuple[bytes, str]:
+    body = (_ASSETS_DIR / name).read_bytes()
+    return body, '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate == etag or candidate == "W/" + etag:
+            return True
+    return False
+
+
+def _reload_asset_caches() -> None:
+    _read_static_asset.cache_clear()
+    _read_inline_svg.cache_clear()
+    _config_menu_button_html.cache_clear()
+    _css_buster.cache_clear()
+
+
+_MEDIA_FORMATS_URL = (
+    "https://github.com/HVR88/Docs-Extras/blob/master/docs/Media-Formats.md"
+)
+_MEDIA_TYPE_LINK_HTML = (
+    '<a class="config-link" href="{}" target="_blank" rel="noopener">Media type</a>'
+).format(_escape_html(_MEDIA_FORMATS_URL))
+_FILTER_ENABLED_LABEL_HTML = (
+    f"<span data-filter-label-enabled>{_MEDIA_TYPE_LINK_HTML} filtering enabled</span>"
+    f'<span data-filter-label-disabled style="display:none">{_MEDIA_TYPE_LINK_HTML} filtering disabled</span>'
+)
+_CONFIG_TOGGLE_HTML = {
+    enabled: (
+        '<label class="config-toggle">'
+        f'<input type="checkbox" data-config-enabled {"checked" if enabled else ""} />'
+        '<span class="config-toggle__track" aria-hidden="true">'
+        '<span class="config-toggle__thumb"></span>'
+        "</span>"
+        "</label>"
+    )
+    for enabled in (True, False)
+}
+# Root page class strings, indexed by whether the flag is set.
+_VERSION_PART_CLASS = ("version-part", "version-part version-part--update")
+_REPLICATION_PILL_CLASS = ("pill has-action", "pill has-action wide-action")
+_MBMS_PILLS_FMT = "\n".join(
+    [
+        '          <button type="button" class="pill" disabled>',
+        '            <div class="label">&nbsp;</div>',
+        '            <div class="value">&nbsp;</div>',
+        "          </button>",
+        '          <button type="button" class="pill" data-pill-href="" data-modal-open="schedule-indexer">',
+        '            <div class="label">DB Indexing Schedule</div>',
+        '            <div class="value">{index_schedule}</div>',
+        '            <span class="pill-arrow" aria-hidden="true">{arrow}</span>',
+        "          </button>",
+        '          <button type="button" class="pill" data-pill-href="" data-modal-open="schedule-replication">',
+        '            <div class="label">DB Replication Schedule</div>',
+        '            <div class="value">{replication_schedule}</div>',
+        "            {lidarr_arrow}",
+        "          </button>",
+    ]
+)
+_LM_VERSION_FMT = (
+    '<span class="{mbms_class}"{mbms_title}>{mbms_label}</span> '
+    '(<span class="{bridge_class}"{bridge_title}>{bridge_label}</span>)'
+)
+# Pill markup rendered with str.format_map; indexed by whether the pill has an href.
+_PILL_TAG_OPEN_FMT = (
+    '<button type="button" class="{cls}" disabled>',
+    '<button type="button" class="{cls}" data-pill-href="{href}">',
+)
+_LM_PILL_FMT = "\n".join(
+    [
+        "          {tag_open}",
+        '            <div class="label">LIMBO (BRIDGE/WEBUI)</div>',
+        '            <div class="value">{value}</div>',
+        '            <span class="pill-arrow" aria-hidden="true">{arrow}</span>',
+        "          </button>",
+    ]
+)
+_LIDARR_PILL_FMT = "\n".join(
+    [
+        "          {tag_open}",
+        '            <div class="label" data-lidarr-pill-label>{label}</div>',
+        '            <div class="value" data-lidarr-pill-value>{value}</div>',
+        '            <span class="pill-arrow" aria-hidden="true">{arrow}</span>',
+        "          </button>",
+    ]
+)
+_REPLICATION_PILL_FMT = "\n".join(
+    [
+        '          <button type="button" class="{cls}" data-replication-pill data-pill-href="{href}">',
+        '            <div class="label">Last Replication</div>',
+        '            <div class="value replication-date" data-replication-value>{value}</div>',
+        '            <span class="pill-arrow" aria-hidden="true">{arrow}</span>',
+        "          </button>",
+    ]
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _config_menu_button_html() -> str:
+    return (
+        '<button class="config-action" type="button" aria-label="More" data-config-menu>'
+        f'<span class="config-action__inner">{_read_inline_svg("limbo-arrows-updn.svg")}</span>'
+        "</button>"
+    )
+
+
+# Root page links under the app's ROOT_PATH.
+_ROUTE_URL_PATHS = (
+    ("__ICON_URL__", "/assets/limbo-icon.png"),
+    ("__VERSION_URL__", "/version"),
+    ("__CACHE_CLEAR_URL__", "/cache/clear"),
+    ("__CACHE_EXPIRE_URL__", "/cache/expire"),
+    ("__REPLICATION_START_URL__", "/replication/start"),
+    ("__REPLICATION_STATUS_URL__", "/replication/status"),
+    ("__MUSICBRAINZ_UI_URL__", "/musicbrainz"),
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _route_url_replacements(base_path: str, api_key: str) -> Dict[str, str]:
+    # Both inputs come from app config and are effectively fixed after startup.
+    replacements = {
+        key: _escape_html(base_path + path) for key, path in _ROUTE_URL_PATHS
+    }
+    replacements["__LIMBO_APIKEY__"] = _escape_html(api_key)
+    return replacements
+
+
+# Every __NAME__ placeholder in root.html, plus the stylesheet link that gets
+# its cache-buster appended. Unknown tokens are left untouched.
+_PLACEHOLDER_RE = re.compile(r'(__[A-Z][A-Z0-9_]*__|href="/assets/root\.css")')
+
+
+@functools.lru_cache(maxsize=2)
+def _compile_template(template: str) -> Tuple[Tuple[bytes, ...], Tuple[str, ...]]:
+    # Split once into literal chunks and the placeholders between them; the
+    # scan over the ~270KB template is what dominates a render. Literals are
+    # kept encoded so a render only encodes the values.
+    tokens = _PLACEHOLDER_RE.split(template)
+    literals = tuple(chunk.encode("utf-8") for chunk in tokens[0::2])
+    return literals, tuple(tokens[1::2])
+
+
+_UNRENDERED_PLACEHOLDERS: Set[str] = set()
+
+
+def _render_template(template: str, replacements: Dict[str, str]) -> bytes:
+    literals, keys = _compile_template(template)
+    lookup = replacements.get
+    values = [lookup(key) for key in keys]
+    if None in values:
+        # Left in place as before, but a placeholder nothing fills is a
+        # template/route mismatch worth hearing about once.
+        missing = {key for key, value in zip(keys, values) if value is None}
+        new = missing - _UNRENDERED_PLACEHOLDERS
+        if new:
+            _UNRENDERED_PLACEHOLDERS.update(new)
+            logger.warning(
+                "root.html placeholders without a value: %s", ", ".join(sorted(new))
+            )
+        values = [key if value is None else value for key, value in zip(keys, values)]
+    out = [b""] * (len(literals) + len(keys))
+    out[0::2] = literals
+    out[1::2] = [value.encode("utf-8") for value in values]
+    return b"".join(out)
+
+
+# Consecutive renders usually produce identical replacements (uptime moves in
+# whole minutes after the first hour), so the encoded page is memoized. The
+# template string is part of the key; its hash is cached on the object.
+@functools.lru_cache(maxsize=8)
+def _render_page(template: str, items: Tuple[Tuple[str, str], ...]) -> Tuple[bytes, str]:
+    body = _render_template(template, dict(items))
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    return body, etag
+
+
+_ROOT_TEMPLATE: Optional[str] = None
+_ROOT_TEMPLATE_MTIME = 0
+
+
+def _read_root_template() -> str:
+    global _ROOT_TEMPLATE, _ROOT_TEMPLATE_MTIME
+    template_path = _ASSETS_DIR / "root.html"
+    if _ROOT_TEMPLATE is not None:
+        if not _DEV_ASSETS:
+            return _ROOT_TEMPLATE
+        try:
+            if template_path.stat().st_mtime_ns == _ROOT_TEMPLATE_MTIME:
+                return _ROOT_TEMPLATE
+        except OSError:
+            return _ROOT_TEMPLATE
+    with template_path.open("r", encoding="utf-8") as handle:
+        _ROOT_TEMPLATE_MTIME = os.fstat(handle.fileno()).st_mtime_ns
+        _ROOT_TEMPLATE = handle.read()
+    # Split into the render plan now (at registration) rather than on the
+    # first request.
+    _compile_template(_ROOT_TEMPLATE)
+    return _ROOT_TEMPLATE
+
+
+def _parse_normalized_version(normalized: str) -> Optional[Tuple[int, ...]]:
     if not normalized:
         return None
     parts = normalized.split(".")
@@ -154,40 +450,59 @@ def _parse_version(value: str) -> Optional[Tuple[int, ...]]:
 
 
 def _is_newer_version(current: str, latest: str) -> bool:
-    current_tuple = _parse_version(current)
-    latest_tuple = _parse_version(latest)
+    if current == latest:
+        return False
+    current_normalized = _normalize_version_string(current)
+    latest_normalized = _normalize_version_string(latest)
+    if current_normalized == latest_normalized:
+        return False
+    current_tuple = _parse_normalized_version(current_normalized)
+    latest_tuple = _parse_normalized_version(latest_normalized)
     if not current_tuple or not latest_tuple:
         return False
-    max_len = max(len(current_tuple), len(latest_tuple))
-    current_tuple += (0,) * (max_len - len(current_tuple))
-    latest_tuple += (0,) * (max_len - len(latest_tuple))
-    return latest_tuple > current_tuple
+    for current_part, latest_part in itertools.zip_longest(
+        current_tuple, latest_tuple, fillvalue=0
+    ):
+        if current_part != latest_part:
+            return latest_part > current_part
+    return False
 
 
 def _resolve_limbo_host_url(_lidarr_base_url: str) -> str:
-    gateway_ip, _error = _get_default_gateway_ip()
+    gateway_ip, _error = get_default_gateway_ip()
     if not gateway_ip:
         return ""
     limbo_port = os.getenv("LIMBO_PORT", "").strip() or "5001"
     return f"http://{gateway_ip}:{limbo_port}"
 
 
-def _get_default_gateway_ip() -> Tuple[str, str]:
+def get_default_gateway_ip() -> Tuple[str, str]:
+    global _GATEWAY_CACHE
+    now = time.monotonic()
+    cached = _GATEWAY_CACHE
+    if cached is not None and now < cached[0]:
+        return cached[1], cached[2]
+    gateway_ip, error = _read_default_gateway_ip()
+    _GATEWAY_CACHE = (now + _GATEWAY_CACHE_TTL, gateway_ip, error)
+    return gateway_ip, error
+
+
+def _read_default_gateway_ip() -> Tuple[str, str]:
     try:
         with open("/proc/net/route", "r", encoding="utf-8") as fh:
             for line in fh:
-                fields = line.strip().split()
+                fields = line.split(None, 3)
                 if len(fields) < 3:
                     continue
                 iface, dest, gateway = fields[0], fields[1], fields[2]
                 if iface == "Iface" or dest != "00000000":
                     continue
                 try:
-                    gateway_ip = socket.inet_ntoa(
-                        int(gateway, 16).to_bytes(4, "little")
-                    )
-                except Exception:
+                    b0, b1, b2, b3 = bytes.fromhex(gateway)
+                except ValueError:
                     continue
+                # /proc/net/route stores the address as little-endian hex.
+                gateway_ip = f"{b3}.{b2}.{b1}.{b0}"
                 if gateway_ip and gateway_ip != "0.0.0.0":
                     return gateway_ip, ""
     except Exception as exc:
@@ -195,55 +510,147 @@ def _get_default_gateway_ip() -> Tuple[str, str]:
     return "", "Default gateway not found."
 
 
+async def _get_github_session() -> "aiohttp.ClientSession":
+    global _GITHUB_SESSION
+    if _GITHUB_SESSION is None or _GITHUB_SESSION.closed:
+        _GITHUB_SESSION = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=3),
+            connector=aiohttp.TCPConnector(
+                limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=75
+            ),
+        )
+    return _GITHUB_SESSION
+
+
+async def _close_github_session() -> None:
+    global _GITHUB_SESSION
+    session, _GITHUB_SESSION = _GITHUB_SESSION, None
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def _get_http_session() -> "aiohttp.ClientSession":
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None or _HTTP_SESSION.closed:
+        _HTTP_SESSION = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=4),
+            connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=30),
+        )
+    return _HTTP_SESSION
+
+
+async def _close_http_session() -> None:
+    global _HTTP_SESSION
+    session, _HTTP_SESSION = _HTTP_SESSION, None
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def _github_retry_at(resp: "aiohttp.ClientResponse") -> Optional[float]:
+    if resp.status not in (403, 429):
+        return None
+    if resp.headers.get("X-RateLimit-Remaining") != "0":
+        return None
+    try:
+        return float(resp.headers.get("X-RateLimit-Reset") or "")
+    except ValueError:
+        return None
+
+
 async def _fetch_latest_release_version(owner: str, repo: str) -> Optional[str]:
     if aiohttp is None:
         return None
     key = f"{owner}/{repo}"
     now = time.time()
     cached = _GITHUB_RELEASE_CACHE.get(key)
-    if cached and (now - cached[0]) < _GITHUB_RELEASE_CACHE_TTL:
+    if cached and now < cached[0]:
         return cached[1]
 
+    inflight = _GITHUB_INFLIGHT.get(key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _GITHUB_INFLIGHT[key] = future
     version: Optional[str] = None
+    try:
+        version = await _lookup_latest_release_version(owner, repo, key, now)
+    finally:
+        _GITHUB_INFLIGHT.pop(key, None)
+        if not future.done():
+            future.set_result(version)
+    return version
+
+
+async def _lookup_latest_release_version(
+    owner: str, repo: str, key: str, now: float
+) -> Optional[str]:
+    version: Optional[str] = None
+    retry_at: Optional[float] = None
+    previous = _GITHUB_RELEASE_CACHE.get(key)
+    skip_releases = previous is not None and previous[2]
+    tags_only = False
     headers = {
         "Accept": "application/vnd.github+json",
         "User-Agent": "limbo",
     }
-    timeout = aiohttp.ClientTimeout(total=3)
     try:
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        session = await _get_github_session()
+        if not skip_releases:
             url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
             try:
                 async with session.get(url, headers=headers) as resp:
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = await resp.json(loads=_json_loads)
                         tag = data.get("tag_name") or data.get("name")
                         version = _normalize_version_string(tag) or None
-                    elif resp.status not in (404, 422):
-                        version = None
+                    elif resp.status in (404, 422):
+                        tags_only = True
+                    else:
+                        retry_at = _github_retry_at(resp)
             except Exception:
                 version = None
 
-            if not version:
-                url = f"https://api.github.com/repos/{owner}/{repo}/tags?per_page=1"
-                try:
-                    async with session.get(url, headers=headers) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            if data:
-                                tag = data[0].get("name")
-                                version = _normalize_version_string(tag) or None
-                except Exception:
-                    version = None
+        if not version and retry_at is None:
+            url = f"https://api.github.com/repos/{owner}/{repo}/tags?per_page=1"
+            try:
+                async with session.get(url, headers=headers) as resp:
+                    if resp.status == 200:
+                        data = await resp.json(loads=_json_loads)
+                        if data:
+                            tag = data[0].get("name")
+                            version = _normalize_version_string(tag) or None
+                    else:
+                        retry_at = _github_retry_at(resp)
+            except Exception:
+                version = None
     finally:
-        _GITHUB_RELEASE_CACHE[key] = (now, version)
+        expires_at = now + (
+            _GITHUB_RELEASE_CACHE_TTL if version else _GITHUB_RELEASE_NEG_TTL
+        )
+        if retry_at is not None:
+            expires_at = max(expires_at, retry_at)
+        _GITHUB_RELEASE_CACHE[key] = (expires_at, version, tags_only)
 
     return version
 
 
+def _cached_release_version(owner: str, repo: str) -> Optional[str]:
+    key = f"{owner}/{repo}"
+    cached = _GITHUB_RELEASE_CACHE.get(key)
+    if (cached is None or time.time() >= cached[0]) and aiohttp is not None:
+        if key not in _GITHUB_REFRESH_TASKS:
+            task = asyncio.get_running_loop().create_task(
+                _fetch_latest_release_version(owner, repo)
+            )
+            _GITHUB_REFRESH_TASKS[key] = task
+            task.add_done_callback(lambda _t: _GITHUB_REFRESH_TASKS.pop(key, None))
+    return cached[1] if cached else None
+
+
 def _read_mbms_plus_version() -> str:
     try:
-        value = _MBMS_VERSION_FILE.read_text().strip()
+        value = _MBMS_VERSION_FILE.read_bytes().decode("utf-8", "replace").strip()
     except OSError:
         value = ""
     return value or "not MBMS"
@@ -252,124 +659,59 @@ def _read_mbms_plus_version() -> str:
 def _read_full_limbo_version() -> str:
     version_path = Path(os.environ.get("LIMBO_VERSION_FILE", "/metadata/VERSION"))
     try:
-        value = version_path.read_text().strip()
+        value = version_path.read_bytes().decode("utf-8", "replace").strip()
     except OSError:
         value = ""
     return value or _read_version()
 
 
+def _read_settings_file() -> dict:
+    global _SETTINGS_CACHE
+    mtime_ns = _SETTINGS_FILE.stat().st_mtime_ns
+    cached = _SETTINGS_CACHE
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    data = json.loads(_SETTINGS_FILE.read_bytes())
+    _SETTINGS_CACHE = (mtime_ns, data)
+    return data
+
+
 def _load_lidarr_settings() -> None:
-    global _LIDARR_BASE_URL, _LIDARR_API_KEY, _SLSKD_BASE_URL, _SLSKD_API_KEY
-    global _LIMBO_URL_MODE, _LIMBO_URL_CUSTOM
-    global _FANART_KEY, _TADB_KEY, _LASTFM_KEY, _LASTFM_SECRET
-    global _TIDAL_CLIENT_ID, _TIDAL_CLIENT_SECRET, _TIDAL_COUNTRY_CODE
-    global _TIDAL_USER, _TIDAL_USER_PASSWORD, _DISCOGS_KEY
-    global _FANART_ENABLED, _TADB_ENABLED, _LASTFM_ENABLED
-    global _TIDAL_ENABLED, _DISCOGS_ENABLED, _DISCOGS_MIRROR_ENABLED
-    global _APPLE_MUSIC_ENABLED, _PLEX_ENABLED
-    global _APPLE_MUSIC_MAX_IMAGE_SIZE, _APPLE_MUSIC_ALLOW_UPSCALE
-    global _COVERART_ENABLED, _COVERART_SIZE, _MUSICBRAINZ_ENABLED, _WIKIPEDIA_ENABLED
-    global _REFRESH_RESOLVE_NAMES, _REFRESH_AUTO_REFRESH
-    global _REFRESH_SWITCH_RELEASE_MODE, _SERVICE_PRIORITY_ORDERS
+    global _SERVICE_PRIORITY_ORDERS
+    module_globals = globals()
+    env = {
+        name: str(os.getenv(var) or "").strip()
+        for name, var in _SETTINGS_ENV_KEYS.items()
+    }
     try:
-        data = json.loads(_SETTINGS_FILE.read_text(encoding="utf-8"))
+        data = _read_settings_file()
+        first_run = False
     except Exception:
-        fanart_env = str(os.getenv("FANART_KEY") or "").strip()
-        tadb_env = str(os.getenv("TADB_KEY") or "").strip()
-        lastfm_env = str(os.getenv("LASTFM_KEY") or "").strip()
-        lastfm_secret_env = str(os.getenv("LASTFM_SECRET") or "").strip()
-        tidal_client_id_env = str(os.getenv("TIDAL_CLIENT_ID") or "").strip()
-        tidal_client_secret_env = str(os.getenv("TIDAL_CLIENT_SECRET") or "").strip()
-        tidal_country_code_env = str(os.getenv("TIDAL_COUNTRY_CODE") or "").strip()
-        tidal_user_env = str(os.getenv("TIDAL_USER") or "").strip()
-        tidal_user_password_env = str(os.getenv("TIDAL_USER_PASSWORD") or "").strip()
-        discogs_env = str(os.getenv("DISCOGS_KEY") or "").strip()
-        plex_url_env = str(os.getenv("PLEX_URL") or "").strip()
-        plex_token_env = str(os.getenv("PLEX_TOKEN") or "").strip()
-        _LIDARR_BASE_URL = ""
-        _LIDARR_API_KEY = ""
-        _SLSKD_BASE_URL = ""
-        _SLSKD_API_KEY = ""
-        _LIMBO_URL_MODE = "auto-referrer"
-        _LIMBO_URL_CUSTOM = ""
-        _FANART_KEY = fanart_env
-        _TADB_KEY = tadb_env
-        _LASTFM_KEY = lastfm_env
-        _LASTFM_SECRET = lastfm_secret_env
-        _TIDAL_CLIENT_ID = tidal_client_id_env
-        _TIDAL_CLIENT_SECRET = tidal_client_secret_env
-        _TIDAL_COUNTRY_CODE = tidal_country_code_env
-        _TIDAL_USER = tidal_user_env
-        _TIDAL_USER_PASSWORD = tidal_user_password_env
-        _DISCOGS_KEY = discogs_env
-        _FANART_ENABLED = bool(fanart_env)
-        _TADB_ENABLED = bool(tadb_env)
-        _LASTFM_ENABLED = bool(lastfm_env or lastfm_secret_env)
-        _TIDAL_ENABLED = bool(
-            tidal_client_id_env
-            or tidal_client_secret_env
-            or tidal_country_code_env
-            or tidal_user_env
-            or tidal_user_password_env
-        )
-        _DISCOGS_ENABLED = bool(discogs_env)
-        _DISCOGS_MIRROR_ENABLED = True
-        _APPLE_MUSIC_ENABLED = True
-        _PLEX_ENABLED = bool(plex_url_env or plex_token_env)
-        _APPLE_MUSIC_MAX_IMAGE_SIZE = "1000"
-        _APPLE_MUSIC_ALLOW_UPSCALE = False
-        _COVERART_ENABLED = True
-        _COVERART_SIZE = "original"
-        _MUSICBRAINZ_ENABLED = True
-        _WIKIPEDIA_ENABLED = True
-        _REFRESH_RESOLVE_NAMES = True
-        _REFRESH_AUTO_REFRESH = True
-        _REFRESH_SWITCH_RELEASE_MODE = "no-change"
-        _SERVICE_PRIORITY_ORDERS = {
-            "metadata": [],
-            "artistart": [],
-            "albumart": [],
-            "fanart": [],
-        }
-        _persist_lidarr_settings()
-        return
-    _LIDARR_BASE_URL = str(data.get("lidarr_base_url") or "").strip()
-    _LIDARR_API_KEY = str(data.get("lidarr_api_key") or "").strip()
-    _SLSKD_BASE_URL = str(data.get("slskd_base_url") or "").strip()
-    _SLSKD_API_KEY = str(data.get("slskd_api_key") or "").strip()
-    mode = str(data.get("limbo_url_mode") or "").strip().lower()
-    if mode not in {"auto-referrer", "auto-host", "custom"}:
-        mode = "auto-referrer"
-    _LIMBO_URL_MODE = mode
-    _LIMBO_URL_CUSTOM = str(data.get("limbo_url") or "").strip()
-    _FANART_KEY = str(data.get("fanart_key") or "").strip()
-    _TADB_KEY = str(data.get("tadb_key") or "").strip()
-    _LASTFM_KEY = str(data.get("lastfm_key") or "").strip()
-    _LASTFM_SECRET = str(data.get("lastfm_secret") or "").strip()
-    _TIDAL_CLIENT_ID = str(data.get("tidal_client_id") or "").strip()
-    _TIDAL_CLIENT_SECRET = str(data.get("tidal_client_secret") or "").strip()
-    _TIDAL_COUNTRY_CODE = str(data.get("tidal_country_code") or "").strip()
-    _TIDAL_USER = str(data.get("tidal_user") or "").strip()
-    _TIDAL_USER_PASSWORD = str(data.get("tidal_user_password") or "").strip()
-    _DISCOGS_KEY = str(data.get("discogs_key") or "").strip()
-    _COVERART_SIZE = str(data.get("coverart_size") or "").strip()
-    _APPLE_MUSIC_MAX_IMAGE_SIZE = str(
-        data.get("apple_music_max_image_size") or ""
-    ).strip()
-    _APPLE_MUSIC_ALLOW_UPSCALE = _read_enabled_flag(
-        data.get("apple_music_allow_upscale"), False
-    )
-    refresh_present = "refresh_resolve_names" in data
-    _REFRESH_RESOLVE_NAMES = _read_enabled_flag(
-        data.get("refresh_resolve_names"), True
-    )
-    _REFRESH_AUTO_REFRESH = _read_enabled_flag(
-        data.get("refresh_auto_refresh"), True
-    )
-    switch_release_mode = str(data.get("refresh_switch_release_mode") or "").strip().lower()
-    if switch_release_mode not in {"auto", "off", "no-change"}:
-        switch_release_mode = "no-change"
-    _REFRESH_SWITCH_RELEASE_MODE = switch_release_mode
+        data = {}
+        first_run = True
+
+    for name, (global_name, kind, key, default, choices) in _SETTINGS_SCHEMA.items():
+        if key is None:
+            continue
+        raw = data.get(key)
+        if kind == "bool":
+            if name in _SETTINGS_ENV_ENABLED:
+                fallback = any(env[field] for field in _SETTINGS_ENV_ENABLED[name])
+            elif first_run and name in _SETTINGS_FIRST_RUN_ENV_ENABLED:
+                fallback = any(
+                    str(os.getenv(var) or "").strip()
+                    for var in _SETTINGS_FIRST_RUN_ENV_ENABLED[name]
+                )
+            else:
+                fallback = _SETTINGS_BOOL_DEFAULTS.get(name, False)
+            value = _read_enabled_flag(raw, fallback)
+        elif kind == "choice":
+            text = str(raw or "").strip().lower()
+            value = text if text in choices else default
+        else:
+            value = str(raw or "").strip()
+        module_globals[global_name] = value
+
     raw_orders = data.get("service_priority_orders")
     normalized_orders: Dict[str, List[str]] = {
         "metadata": [],
@@ -387,160 +729,83 @@ def _load_lidarr_settings() -> None:
                     if str(item).strip()
                 ]
     _SERVICE_PRIORITY_ORDERS = normalized_orders
-    fanart_env = str(os.getenv("FANART_KEY") or "").strip()
-    tadb_env = str(os.getenv("TADB_KEY") or "").strip()
-    lastfm_env = str(os.getenv("LASTFM_KEY") or "").strip()
-    lastfm_secret_env = str(os.getenv("LASTFM_SECRET") or "").strip()
-    tidal_client_id_env = str(os.getenv("TIDAL_CLIENT_ID") or "").strip()
-    tidal_client_secret_env = str(os.getenv("TIDAL_CLIENT_SECRET") or "").strip()
-    tidal_country_code_env = str(os.getenv("TIDAL_COUNTRY_CODE") or "").strip()
-    tidal_user_env = str(os.getenv("TIDAL_USER") or "").strip()
-    tidal_user_password_env = str(os.getenv("TIDAL_USER_PASSWORD") or "").strip()
-    discogs_env = str(os.getenv("DISCOGS_KEY") or "").strip()
-    _FANART_ENABLED = _read_enabled_flag(
-        data.get("fanart_enabled"), bool(fanart_env)
-    )
-    _TADB_ENABLED = _read_enabled_flag(data.get("tadb_enabled"), bool(tadb_env))
-    _LASTFM_ENABLED = _read_enabled_flag(
-        data.get("lastfm_enabled"), bool(lastfm_env or lastfm_secret_env)
-    )
-    _TIDAL_ENABLED = _read_enabled_flag(
-        data.get("tidal_enabled"),
-        bool(
-            tidal_client_id_env
-            or tidal_client_secret_env
-            or tidal_country_code_env
-            or tidal_user_env
-            or tidal_user_password_env
-        ),
-    )
-    _DISCOGS_ENABLED = _read_enabled_flag(
-        data.get("discogs_enabled"), bool(discogs_env)
-    )
-    _DISCOGS_MIRROR_ENABLED = _read_enabled_flag(
-        data.get("discogs_mirror_enabled"), True
-    )
-    _APPLE_MUSIC_ENABLED = _read_enabled_flag(data.get("apple_music_enabled"), True)
-    _PLEX_ENABLED = _read_enabled_flag(data.get("plex_enabled"), False)
-    _COVERART_ENABLED = _read_enabled_flag(data.get("coverart_enabled"), True)
-    _MUSICBRAINZ_ENABLED = _read_enabled_flag(data.get("musicbrainz_enabled"), True)
-    _WIKIPEDIA_ENABLED = _read_enabled_flag(data.get("wikipedia_enabled"), True)
-    if not refresh_present:
-        _persist_lidarr_settings()
-    if _APPLE_MUSIC_ENABLED and not _APPLE_MUSIC_MAX_IMAGE_SIZE:
-        _APPLE_MUSIC_MAX_IMAGE_SIZE = "1000"
-    if _COVERART_ENABLED and not _COVERART_SIZE:
-        _COVERART_SIZE = "original"
-    if _FANART_ENABLED and not _FANART_KEY:
-        _FANART_KEY = fanart_env
-    if _TADB_ENABLED and not _TADB_KEY:
-        _TADB_KEY = tadb_env
-    if _LASTFM_ENABLED and not _LASTFM_KEY:
-        _LASTFM_KEY = lastfm_env
-    if _LASTFM_ENABLED and not _LASTFM_SECRET:
-        _LASTFM_SECRET = lastfm_secret_env
-    if _TIDAL_ENABLED and not _TIDAL_CLIENT_ID:
-        _TIDAL_CLIENT_ID = tidal_client_id_env
-    if _TIDAL_ENABLED and not _TIDAL_CLIENT_SECRET:
-        _TIDAL_CLIENT_SECRET = tidal_client_secret_env
-    if _TIDAL_ENABLED and not _TIDAL_COUNTRY_CODE:
-        _TIDAL_COUNTRY_CODE = tidal_country_code_env
-    if _TIDAL_ENABLED and not _TIDAL_USER:
-        _TIDAL_USER = tidal_user_env
-    if _TIDAL_ENABLED and not _TIDAL_USER_PASSWORD:
-        _TIDAL_USER_PASSWORD = tidal_user_password_env
-    if _DISCOGS_ENABLED and not _DISCOGS_KEY:
-        _DISCOGS_KEY = discogs_env
-    return
-
-
-def _persist_lidarr_settings() -> None:
-    try:
-        _SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        payload = {
-            "lidarr_base_url": _LIDARR_BASE_URL or "",
-            "lidarr_api_key": _LIDARR_API_KEY or "",
-            "slskd_base_url": _SLSKD_BASE_URL or "",
-            "slskd_api_key": _SLSKD_API_KEY or "",
-            "limbo_url_mode": _LIMBO_URL_MODE or "auto-referrer",
-            "limbo_url": _LIMBO_URL_CUSTOM or "",
-            "fanart_key": _FANART_KEY or "",
-            "tadb_key": _TADB_KEY or "",
-            "lastfm_key": _LASTFM_KEY or "",
-            "lastfm_secret": _LASTFM_SECRET or "",
-            "tidal_client_id": _TIDAL_CLIENT_ID or "",
-            "tidal_client_secret": _TIDAL_CLIENT_SECRET or "",
-            "tidal_country_code": _TIDAL_COUNTRY_CODE or "",
-            "tidal_user": _TIDAL_USER or "",
-            "tidal_user_password": _TIDAL_USER_PASSWORD or "",
-            "discogs_key": _DISCOGS_KEY or "",
-            "coverart_enabled": bool(_COVERART_ENABLED),
-            "coverart_size": _COVERART_SIZE or "",
-            "musicbrainz_enabled": bool(_MUSICBRAINZ_ENABLED),
-            "wikipedia_enabled": bool(_WIKIPEDIA_ENABLED),
-            "refresh_resolve_names": bool(_REFRESH_RESOLVE_NAMES),
-            "refresh_auto_refresh": bool(_REFRESH_AUTO_REFRESH),
-            "refresh_switch_release_mode": _REFRESH_SWITCH_RELEASE_MODE
-            if _REFRESH_SWITCH_RELEASE_MODE in {"auto", "off", "no-change"}
-            else "no-change",
-            "service_priority_orders": {
-                "metadata": list(_SERVICE_PRIORITY_ORDERS.get("metadata") or []),
-                "artistart": list(_SERVICE_PRIORITY_ORDERS.get("artistart") or []),
-                "albumart": list(_SERVICE_PRIORITY_ORDERS.get("albumart") or []),
-                "fanart": list(_SERVICE_PRIORITY_ORDERS.get("fanart") or []),
-            },
-            "fanart_enabled": bool(_FANART_ENABLED),
-            "tadb_enabled": bool(_TADB_ENABLED),
-            "lastfm_enabled": bool(_LASTFM_ENABLED),
-            "tidal_enabled": bool(_TIDAL_ENABLED),
-            "discogs_enabled": bool(_DISCOGS_ENABLED),
-            "discogs_mirror_enabled": bool(_DISCOGS_MIRROR_ENABLED),
-            "apple_music_enabled": bool(_APPLE_MUSIC_ENABLED),
-            "plex_enabled": bool(_PLEX_ENABLED),
-            "apple_music_max_image_size": _APPLE_MUSIC_MAX_IMAGE_SIZE or "",
-            "apple_music_allow_upscale": bool(_APPLE_MUSIC_ALLOW_UPSCALE),
-        }
-        _SETTINGS_FILE.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
-    except Exception:
-        return
-
 
-def set_lidarr_base_url(value: str) -> None:
-    _set_lidarr_base_url(value, persist=True)
+    # An existing file missing newer keys is rewritten with what it holds; the
+    # fills below are runtime-only so env secrets never land in the file.
+    if not first_run and "refresh_resolve_names" not in data:
+        _write_lidarr_settings_now()
 
+    for enabled_name, (field, fallback) in _SETTINGS_ENABLED_VALUE_DEFAULTS.items():
+        if module_globals[_SETTINGS_SCHEMA[enabled_name][0]]:
+            field_global = _SETTINGS_SCHEMA[field][0]
+            if not module_globals[field_global]:
+                module_globals[field_global] = fallback
+    for enabled_name, fields in _SETTINGS_ENV_ENABLED.items():
+        if not module_globals[_SETTINGS_SCHEMA[enabled_name][0]]:
+            continue
+        for field in fields:
+            field_global = _SETTINGS_SCHEMA[field][0]
+            if not module_globals[field_global]:
+                module_globals[field_global] = env[field]
 
-def set_lidarr_base_url_runtime(value: str) -> None:
-    _set_lidarr_base_url(value, persist=False)
+    if first_run:
+        _write_lidarr_settings_now()
 
 
-def _set_lidarr_base_url(value: str, *, persist: bool) -> None:
-    global _LIDARR_BASE_URL
-    _LIDARR_BASE_URL = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+def _write_lidarr_settings_now() -> None:
+    # Unlike the debounced setters, the load path must snapshot the settings
+    # at the point it asks for the write.
+    with _PERSIST_WRITE_LOCK:
+        _write_lidarr_settings()
 
 
-def get_lidarr_base_url() -> str:
-    return _LIDARR_BASE_URL or ""
+def _persist_lidarr_settings() -> None:
+    global _PERSIST_TIMER
+    with _PERSIST_LOCK:
+        if _PERSIST_TIMER is not None:
+            # The pending write snapshots settings when it fires.
+            return
+        _PERSIST_TIMER = threading.Timer(_PERSIST_DELAY, _flush_lidarr_settings)
+        _PERSIST_TIMER.start()
 
 
-def set_lidarr_api_key(value: str) -> None:
-    _set_lidarr_api_key(value, persist=True)
+def _flush_lidarr_settings() -> None:
+    global _PERSIST_TIMER
+    with _PERSIST_LOCK:
+        _PERSIST_TIMER = None
+    with _PERSIST_WRITE_LOCK:
+        _write_lidarr_settings()
 
 
-def set_lidarr_api_key_runtime(value: str) -> None:
-    _set_lidarr_api_key(value, persist=False)
+def _dump_settings(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2) + b"\n"
+    return (json.dumps(payload, indent=2, sort_keys=True) + "\n").encode("utf-8")
 
 
-def _set_lidarr_api_key(value: str, *, persist: bool) -> None:
-    global _LIDARR_API_KEY
-    _LIDARR_API_KEY = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+def _write_lidarr_settings() -> None:
+    global _LAST_PERSISTED_SETTINGS
+    module_globals = globals()
+    payload = {
+        key: _read_setting(kind, module_globals[global_name], default, choices)
+        for global_name, kind, key, default, choices in _SETTINGS_SCHEMA.values()
+        if key is not None
+    }
+    payload["service_priority_orders"] = get_service_priority_orders()
+    if payload == _LAST_PERSISTED_SETTINGS:
+        return
+    try:
+        body = _dump_settings(payload)
+        tmp_path = _SETTINGS_FILE.with_name(_SETTINGS_FILE.name + ".tmp")
 
+        def _write() -> None:
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, _SETTINGS_FILE)
 
-def get_lidarr_api_key() -> str:
-    return _LIDARR_API_KEY or ""
+        write_in_state_dir(_SETTINGS_FILE.parent, _write)
+    except Exception:
+        return
+    _LAST_PERSISTED_SETTINGS = payload
 
 
 def get_service_priority_orders() -> Dict[str, List[str]]:
@@ -566,38 +831,213 @@ def set_service_priority_order(priority_type: str, order: List[str]) -> None:
     _persist_lidarr_settings()
 
 
-def set_slskd_base_url(value: str) -> None:
-    _set_slskd_base_url(value, persist=True)
+_FLAG_MAP: Dict[str, bool] = {
+    "1": True,
+    "true": True,
+    "yes": True,
+    "on": True,
+    "0": False,
+    "false": False,
+    "no": False,
+    "off": False,
+}
 
 
-def set_slskd_base_url_runtime(value: str) -> None:
-    _set_slskd_base_url(value, persist=False)
+def _read_enabled_flag(value: object, default: bool) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return default
+    return _FLAG_MAP.get(str(value).strip().lower(), default)
+
+
+# name -> (module global, kind, settings-file key, default, choices).
+# "flag" settings are runtime-only error markers and are never persisted.
+_SETTINGS_SCHEMA: Dict[str, Tuple[str, str, Optional[str], object, Optional[Tuple[str, ...]]]] = {
+    "lidarr_base_url": ("_LIDARR_BASE_URL", "str", "lidarr_base_url", "", None),
+    "lidarr_api_key": ("_LIDARR_API_KEY", "str", "lidarr_api_key", "", None),
+    "slskd_base_url": ("_SLSKD_BASE_URL", "str", "slskd_base_url", "", None),
+    "slskd_api_key": ("_SLSKD_API_KEY", "str", "slskd_api_key", "", None),
+    "limbo_url_mode": (
+        "_LIMBO_URL_MODE",
+        "choice",
+        "limbo_url_mode",
+        "auto-referrer",
+        ("auto-referrer", "auto-host", "custom"),
+    ),
+    "limbo_url_custom": ("_LIMBO_URL_CUSTOM", "str", "limbo_url", "", None),
+    "fanart_key": ("_FANART_KEY", "str", "fanart_key", "", None),
+    "tadb_key": ("_TADB_KEY", "str", "tadb_key", "", None),
+    "lastfm_key": ("_LASTFM_KEY", "str", "lastfm_key", "", None),
+    "lastfm_secret": ("_LASTFM_SECRET", "str", "lastfm_secret", "", None),
+    "tidal_client_id": ("_TIDAL_CLIENT_ID", "str", "tidal_client_id", "", None),
+    "tidal_client_secret": ("_TIDAL_CLIENT_SECRET", "str", "tidal_client_secret", "", None),
+    "tidal_country_code": ("_TIDAL_COUNTRY_CODE", "str", "tidal_country_code", "", None),
+    "tidal_user": ("_TIDAL_USER", "str", "tidal_user", "", None),
+    "tidal_user_password": ("_TIDAL_USER_PASSWORD", "str", "tidal_user_password", "", None),
+    "discogs_key": ("_DISCOGS_KEY", "str", "discogs_key", "", None),
+    "fanart_enabled": ("_FANART_ENABLED", "bool", "fanart_enabled", False, None),
+    "tadb_enabled": ("_TADB_ENABLED", "bool", "tadb_enabled", False, None),
+    "lastfm_enabled": ("_LASTFM_ENABLED", "bool", "lastfm_enabled", False, None),
+    "tidal_enabled": ("_TIDAL_ENABLED", "bool", "tidal_enabled", False, None),
+    "discogs_enabled": ("_DISCOGS_ENABLED", "bool", "discogs_enabled", False, None),
+    "discogs_mirror_enabled": (
+        "_DISCOGS_MIRROR_ENABLED", "bool", "discogs_mirror_enabled", False, None
+    ),
+    "apple_music_enabled": ("_APPLE_MUSIC_ENABLED", "bool", "apple_music_enabled", False, None),
+    "plex_enabled": ("_PLEX_ENABLED", "bool", "plex_enabled", False, None),
+    "apple_music_max_image_size": (
+        "_APPLE_MUSIC_MAX_IMAGE_SIZE", "str", "apple_music_max_image_size", "", None
+    ),
+    "apple_music_allow_upscale": (
+        "_APPLE_MUSIC_ALLOW_UPSCALE", "bool", "apple_music_allow_upscale", False, None
+    ),
+    "coverart_enabled": ("_COVERART_ENABLED", "bool", "coverart_enabled", False, None),
+    "coverart_size": ("_COVERART_SIZE", "lower", "coverart_size", "", None),
+    "musicbrainz_enabled": ("_MUSICBRAINZ_ENABLED", "bool", "musicbrainz_enabled", False, None),
+    "wikipedia_enabled": ("_WIKIPEDIA_ENABLED", "bool", "wikipedia_enabled", False, None),
+    "refresh_resolve_names": (
+        "_REFRESH_RESOLVE_NAMES", "bool", "refresh_resolve_names", False, None
+    ),
+    "refresh_auto_refresh": ("_REFRESH_AUTO_REFRESH", "bool", "refresh_auto_refresh", False, None),
+    "refresh_switch_release_mode": (
+        "_REFRESH_SWITCH_RELEASE_MODE",
+        "choice",
+        "refresh_switch_release_mode",
+        "no-change",
+        ("auto", "off", "no-change"),
+    ),
+    "fanart_error": ("_FANART_ERROR", "flag", None, False, None),
+    "tadb_error": ("_TADB_ERROR", "flag", None, False, None),
+    "lastfm_error": ("_LASTFM_ERROR", "flag", None, False, None),
+    "tidal_error": ("_TIDAL_ERROR", "flag", None, False, None),
+    "discogs_error": ("_DISCOGS_ERROR", "flag", None, False, None),
+    "apple_music_error": ("_APPLE_MUSIC_ERROR", "flag", None, False, None),
+    "plex_error": ("_PLEX_ERROR", "flag", None, False, None),
+    "coverart_error": ("_COVERART_ERROR", "flag", None, False, None),
+    "musicbrainz_error": ("_MUSICBRAINZ_ERROR", "flag", None, False, None),
+    "wikipedia_error": ("_WIKIPEDIA_ERROR", "flag", None, False, None),
+}
+
+
+# Settings seeded from the environment: key settings fall back to these env
+# vars, and each provider's enabled flag defaults on when any of its keys is set.
+_SETTINGS_ENV_KEYS: Dict[str, str] = {
+    "fanart_key": "FANART_KEY",
+    "tadb_key": "TADB_KEY",
+    "lastfm_key": "LASTFM_KEY",
+    "lastfm_secret": "LASTFM_SECRET",
+    "tidal_client_id": "TIDAL_CLIENT_ID",
+    "tidal_client_secret": "TIDAL_CLIENT_SECRET",
+    "tidal_country_code": "TIDAL_COUNTRY_CODE",
+    "tidal_user": "TIDAL_USER",
+    "tidal_user_password": "TIDAL_USER_PASSWORD",
+    "discogs_key": "DISCOGS_KEY",
+}
+_SETTINGS_ENV_ENABLED: Dict[str, Tuple[str, ...]] = {
+    "fanart_enabled": ("fanart_key",),
+    "tadb_enabled": ("tadb_key",),
+    "lastfm_enabled": ("lastfm_key", "lastfm_secret"),
+    "tidal_enabled": (
+        "tidal_client_id",
+        "tidal_client_secret",
+        "tidal_country_code",
+        "tidal_user",
+        "tidal_user_password",
+    ),
+    "discogs_enabled": ("discogs_key",),
+}
+# Only consulted when no settings file exists yet.
+_SETTINGS_FIRST_RUN_ENV_ENABLED: Dict[str, Tuple[str, ...]] = {
+    "plex_enabled": ("PLEX_URL", "PLEX_TOKEN"),
+}
+_SETTINGS_BOOL_DEFAULTS: Dict[str, bool] = {
+    "discogs_mirror_enabled": True,
+    "apple_music_enabled": True,
+    "coverart_enabled": True,
+    "musicbrainz_enabled": True,
+    "wikipedia_enabled": True,
+    "refresh_resolve_names": True,
+    "refresh_auto_refresh": True,
+}
+# enabled setting -> (value setting, default applied when enabled but blank)
+_SETTINGS_ENABLED_VALUE_DEFAULTS: Dict[str, Tuple[str, str]] = {
+    "apple_music_enabled": ("apple_music_max_image_size", "1000"),
+    "coverart_enabled": ("coverart_size", "original"),
+}
+
+
+def _normalize_setting(
+    kind: str, value: object, default: object, choices: Optional[Tuple[str, ...]]
+) -> object:
+    if kind in ("bool", "flag"):
+        return bool(value)
+    if kind == "choice":
+        text = str(value or "").strip().lower()
+        return text if text in choices else default
+    text = value.strip() if value else ""
+    return text.lower() if kind == "lower" else text
+
+
+def _read_setting(
+    kind: str, value: object, default: object, choices: Optional[Tuple[str, ...]]
+) -> object:
+    if kind in ("bool", "flag"):
+        return bool(value)
+    if kind == "choice":
+        return value if value in choices else default
+    return value or default
 
 
-def _set_slskd_base_url(value: str, *, persist: bool) -> None:
-    global _SLSKD_BASE_URL
-    _SLSKD_BASE_URL = value.strip() if value else ""
+def _set_setting(name: str, value: object, *, persist: bool) -> None:
+    global_name, kind, _key, default, choices = _SETTINGS_SCHEMA[name]
+    globals()[global_name] = _normalize_setting(kind, value, default, choices)
     if persist:
         _persist_lidarr_settings()
 
 
+def set_lidarr_base_url(value: str) -> None:
+    _set_setting("lidarr_base_url", value, persist=True)
+
+
+def set_lidarr_base_url_runtime(value: str) -> None:
+    _set_setting("lidarr_base_url", value, persist=False)
+
+
+def get_lidarr_base_url() -> str:
+    return _LIDARR_BASE_URL or ""
+
+
+def set_lidarr_api_key(value: str) -> None:
+    _set_setting("lidarr_api_key", value, persist=True)
+
+
+def set_lidarr_api_key_runtime(value: str) -> None:
+    _set_setting("lidarr_api_key", value, persist=False)
+
+
+def get_lidarr_api_key() -> str:
+    return _LIDARR_API_KEY or ""
+
+
+def set_slskd_base_url(value: str) -> None:
+    _set_setting("slskd_base_url", value, persist=True)
+
+
+def set_slskd_base_url_runtime(value: str) -> None:
+    _set_setting("slskd_base_url", value, persist=False)
+
+
 def get_slskd_base_url() -> str:
     return _SLSKD_BASE_URL or ""
 
 
 def set_slskd_api_key(value: str) -> None:
-    _set_slskd_api_key(value, persist=True)
+    _set_setting("slskd_api_key", value, persist=True)
 
 
 def set_slskd_api_key_runtime(value: str) -> None:
-    _set_slskd_api_key(value, persist=False)
-
-
-def _set_slskd_api_key(value: str, *, persist: bool) -> None:
-    global _SLSKD_API_KEY
-    _SLSKD_API_KEY = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("slskd_api_key", value, persist=False)
 
 
 def get_slskd_api_key() -> str:
@@ -605,21 +1045,11 @@ def get_slskd_api_key() -> str:
 
 
 def set_limbo_url_mode(value: str) -> None:
-    _set_limbo_url_mode(value, persist=True)
+    _set_setting("limbo_url_mode", value, persist=True)
 
 
 def set_limbo_url_mode_runtime(value: str) -> None:
-    _set_limbo_url_mode(value, persist=False)
-
-
-def _set_limbo_url_mode(value: str, *, persist: bool) -> None:
-    global _LIMBO_URL_MODE
-    mode = str(value or "").strip().lower()
-    if mode not in {"auto-referrer", "auto-host", "custom"}:
-        mode = "auto-referrer"
-    _LIMBO_URL_MODE = mode
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("limbo_url_mode", value, persist=False)
 
 
 def get_limbo_url_mode() -> str:
@@ -627,18 +1057,11 @@ def get_limbo_url_mode() -> str:
 
 
 def set_limbo_url_custom(value: str) -> None:
-    _set_limbo_url_custom(value, persist=True)
+    _set_setting("limbo_url_custom", value, persist=True)
 
 
 def set_limbo_url_custom_runtime(value: str) -> None:
-    _set_limbo_url_custom(value, persist=False)
-
-
-def _set_limbo_url_custom(value: str, *, persist: bool) -> None:
-    global _LIMBO_URL_CUSTOM
-    _LIMBO_URL_CUSTOM = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("limbo_url_custom", value, persist=False)
 
 
 def get_limbo_url_custom() -> str:
@@ -646,18 +1069,11 @@ def get_limbo_url_custom() -> str:
 
 
 def set_fanart_key(value: str) -> None:
-    _set_fanart_key(value, persist=True)
+    _set_setting("fanart_key", value, persist=True)
 
 
 def set_fanart_key_runtime(value: str) -> None:
-    _set_fanart_key(value, persist=False)
-
-
-def _set_fanart_key(value: str, *, persist: bool) -> None:
-    global _FANART_KEY
-    _FANART_KEY = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("fanart_key", value, persist=False)
 
 
 def get_fanart_key() -> str:
@@ -665,18 +1081,11 @@ def get_fanart_key() -> str:
 
 
 def set_tadb_key(value: str) -> None:
-    _set_tadb_key(value, persist=True)
+    _set_setting("tadb_key", value, persist=True)
 
 
 def set_tadb_key_runtime(value: str) -> None:
-    _set_tadb_key(value, persist=False)
-
-
-def _set_tadb_key(value: str, *, persist: bool) -> None:
-    global _TADB_KEY
-    _TADB_KEY = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("tadb_key", value, persist=False)
 
 
 def get_tadb_key() -> str:
@@ -684,18 +1093,11 @@ def get_tadb_key() -> str:
 
 
 def set_lastfm_key(value: str) -> None:
-    _set_lastfm_key(value, persist=True)
+    _set_setting("lastfm_key", value, persist=True)
 
 
 def set_lastfm_key_runtime(value: str) -> None:
-    _set_lastfm_key(value, persist=False)
-
-
-def _set_lastfm_key(value: str, *, persist: bool) -> None:
-    global _LASTFM_KEY
-    _LASTFM_KEY = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("lastfm_key", value, persist=False)
 
 
 def get_lastfm_key() -> str:
@@ -703,18 +1105,11 @@ def get_lastfm_key() -> str:
 
 
 def set_lastfm_secret(value: str) -> None:
-    _set_lastfm_secret(value, persist=True)
+    _set_setting("lastfm_secret", value, persist=True)
 
 
 def set_lastfm_secret_runtime(value: str) -> None:
-    _set_lastfm_secret(value, persist=False)
-
-
-def _set_lastfm_secret(value: str, *, persist: bool) -> None:
-    global _LASTFM_SECRET
-    _LASTFM_SECRET = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("lastfm_secret", value, persist=False)
 
 
 def get_lastfm_secret() -> str:
@@ -722,18 +1117,11 @@ def get_lastfm_secret() -> str:
 
 
 def set_tidal_client_id(value: str) -> None:
-    _set_tidal_client_id(value, persist=True)
+    _set_setting("tidal_client_id", value, persist=True)
 
 
 def set_tidal_client_id_runtime(value: str) -> None:
-    _set_tidal_client_id(value, persist=False)
-
-
-def _set_tidal_client_id(value: str, *, persist: bool) -> None:
-    global _TIDAL_CLIENT_ID
-    _TIDAL_CLIENT_ID = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("tidal_client_id", value, persist=False)
 
 
 def get_tidal_client_id() -> str:
@@ -741,18 +1129,11 @@ def get_tidal_client_id() -> str:
 
 
 def set_tidal_client_secret(value: str) -> None:
-    _set_tidal_client_secret(value, persist=True)
+    _set_setting("tidal_client_secret", value, persist=True)
 
 
 def set_tidal_client_secret_runtime(value: str) -> None:
-    _set_tidal_client_secret(value, persist=False)
-
-
-def _set_tidal_client_secret(value: str, *, persist: bool) -> None:
-    global _TIDAL_CLIENT_SECRET
-    _TIDAL_CLIENT_SECRET = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("tidal_client_secret", value, persist=False)
 
 
 def get_tidal_client_secret() -> str:
@@ -760,18 +1141,11 @@ def get_tidal_client_secret() -> str:
 
 
 def set_tidal_country_code(value: str) -> None:
-    _set_tidal_country_code(value, persist=True)
+    _set_setting("tidal_country_code", value, persist=True)
 
 
 def set_tidal_country_code_runtime(value: str) -> None:
-    _set_tidal_country_code(value, persist=False)
-
-
-def _set_tidal_country_code(value: str, *, persist: bool) -> None:
-    global _TIDAL_COUNTRY_CODE
-    _TIDAL_COUNTRY_CODE = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("tidal_country_code", value, persist=False)
 
 
 def get_tidal_country_code() -> str:
@@ -779,18 +1153,11 @@ def get_tidal_country_code() -> str:
 
 
 def set_tidal_user(value: str) -> None:
-    _set_tidal_user(value, persist=True)
+    _set_setting("tidal_user", value, persist=True)
 
 
 def set_tidal_user_runtime(value: str) -> None:
-    _set_tidal_user(value, persist=False)
-
-
-def _set_tidal_user(value: str, *, persist: bool) -> None:
-    global _TIDAL_USER
-    _TIDAL_USER = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("tidal_user", value, persist=False)
 
 
 def get_tidal_user() -> str:
@@ -798,18 +1165,11 @@ def get_tidal_user() -> str:
 
 
 def set_tidal_user_password(value: str) -> None:
-    _set_tidal_user_password(value, persist=True)
+    _set_setting("tidal_user_password", value, persist=True)
 
 
 def set_tidal_user_password_runtime(value: str) -> None:
-    _set_tidal_user_password(value, persist=False)
-
-
-def _set_tidal_user_password(value: str, *, persist: bool) -> None:
-    global _TIDAL_USER_PASSWORD
-    _TIDAL_USER_PASSWORD = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("tidal_user_password", value, persist=False)
 
 
 def get_tidal_user_password() -> str:
@@ -817,142 +1177,51 @@ def get_tidal_user_password() -> str:
 
 
 def set_discogs_key(value: str) -> None:
-    _set_discogs_key(value, persist=True)
+    _set_setting("discogs_key", value, persist=True)
 
 
 def set_discogs_key_runtime(value: str) -> None:
-    _set_discogs_key(value, persist=False)
-
-
-def _set_discogs_key(value: str, *, persist: bool) -> None:
-    global _DISCOGS_KEY
-    _DISCOGS_KEY = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("discogs_key", value, persist=False)
 
 
 def get_discogs_key() -> str:
     return _DISCOGS_KEY or ""
 
 
-def _read_enabled_flag(value: object, default: bool) -> bool:
-    if value is None:
-        return default
-    if isinstance(value, bool):
-        return value
-    text = str(value).strip().lower()
-    if text in {"1", "true", "yes", "on"}:
-        return True
-    if text in {"0", "false", "no", "off"}:
-        return False
-    return default
-
-
 def set_fanart_enabled(value: bool) -> None:
-    _set_fanart_enabled(value, persist=True)
-
-
-def _set_fanart_enabled(value: bool, *, persist: bool) -> None:
-    global _FANART_ENABLED
-    _FANART_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("fanart_enabled", value, persist=True)
 
 
 def get_fanart_enabled() -> bool:
     return bool(_FANART_ENABLED)
 
 
-def get_fanart_error() -> bool:
-    return bool(_FANART_ERROR)
-
-
-def set_fanart_error(value: bool) -> None:
-    global _FANART_ERROR
-    _FANART_ERROR = bool(value)
-
-
 def set_tadb_enabled(value: bool) -> None:
-    _set_tadb_enabled(value, persist=True)
-
-
-def _set_tadb_enabled(value: bool, *, persist: bool) -> None:
-    global _TADB_ENABLED
-    _TADB_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("tadb_enabled", value, persist=True)
 
 
 def get_tadb_enabled() -> bool:
     return bool(_TADB_ENABLED)
 
 
-def get_tadb_error() -> bool:
-    return bool(_TADB_ERROR)
-
-
-def set_tadb_error(value: bool) -> None:
-    global _TADB_ERROR
-    _TADB_ERROR = bool(value)
-
-
 def set_lastfm_enabled(value: bool) -> None:
-    _set_lastfm_enabled(value, persist=True)
-
-
-def _set_lastfm_enabled(value: bool, *, persist: bool) -> None:
-    global _LASTFM_ENABLED
-    _LASTFM_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("lastfm_enabled", value, persist=True)
 
 
 def get_lastfm_enabled() -> bool:
     return bool(_LASTFM_ENABLED)
 
 
-def get_lastfm_error() -> bool:
-    return bool(_LASTFM_ERROR)
-
-
-def set_lastfm_error(value: bool) -> None:
-    global _LASTFM_ERROR
-    _LASTFM_ERROR = bool(value)
-
-
 def set_tidal_enabled(value: bool) -> None:
-    _set_tidal_enabled(value, persist=True)
-
-
-def _set_tidal_enabled(value: bool, *, persist: bool) -> None:
-    global _TIDAL_ENABLED
-    _TIDAL_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("tidal_enabled", value, persist=True)
 
 
 def get_tidal_enabled() -> bool:
     return bool(_TIDAL_ENABLED)
 
 
-def get_tidal_error() -> bool:
-    return bool(_TIDAL_ERROR)
-
-
-def set_tidal_error(value: bool) -> None:
-    global _TIDAL_ERROR
-    _TIDAL_ERROR = bool(value)
-
-
 def set_discogs_enabled(value: bool) -> None:
-    _set_discogs_enabled(value, persist=True)
-
-
-def _set_discogs_enabled(value: bool, *, persist: bool) -> None:
-    global _DISCOGS_ENABLED
-    _DISCOGS_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("discogs_enabled", value, persist=True)
 
 
 def get_discogs_enabled() -> bool:
@@ -960,62 +1229,31 @@ def get_discogs_enabled() -> bool:
 
 
 def set_discogs_mirror_enabled(value: bool) -> None:
-    _set_discogs_mirror_enabled(value, persist=True)
-
-
-def _set_discogs_mirror_enabled(value: bool, *, persist: bool) -> None:
-    global _DISCOGS_MIRROR_ENABLED
-    _DISCOGS_MIRROR_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("discogs_mirror_enabled", value, persist=True)
 
 
 def get_discogs_mirror_enabled() -> bool:
     return bool(_DISCOGS_MIRROR_ENABLED)
 
 
-def get_discogs_error() -> bool:
-    return bool(_DISCOGS_ERROR)
-
-
-def set_discogs_error(value: bool) -> None:
-    global _DISCOGS_ERROR
-    _DISCOGS_ERROR = bool(value)
-
-
 def set_apple_music_enabled(value: bool) -> None:
-    _set_apple_music_enabled(value, persist=True)
-
-
-def _set_apple_music_enabled(value: bool, *, persist: bool) -> None:
-    global _APPLE_MUSIC_ENABLED
-    _APPLE_MUSIC_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("apple_music_enabled", value, persist=True)
 
 
 def get_apple_music_enabled() -> bool:
     return bool(_APPLE_MUSIC_ENABLED)
 
 
-def get_apple_music_error() -> bool:
-    return bool(_APPLE_MUSIC_ERROR)
+def set_plex_enabled(value: bool) -> None:
+    _set_setting("plex_enabled", value, persist=True)
 
 
-def set_apple_music_error(value: bool) -> None:
-    global _APPLE_MUSIC_ERROR
-    _APPLE_MUSIC_ERROR = bool(value)
+def get_plex_enabled() -> bool:
+    return bool(_PLEX_ENABLED)
 
 
 def set_apple_music_max_image_size(value: str) -> None:
-    _set_apple_music_max_image_size(value, persist=True)
-
-
-def _set_apple_music_max_image_size(value: str, *, persist: bool) -> None:
-    global _APPLE_MUSIC_MAX_IMAGE_SIZE
-    _APPLE_MUSIC_MAX_IMAGE_SIZE = value.strip() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("apple_music_max_image_size", value, persist=True)
 
 
 def get_apple_music_max_image_size() -> str:
@@ -1023,14 +1261,7 @@ def get_apple_music_max_image_size() -> str:
 
 
 def set_apple_music_allow_upscale(value: bool) -> None:
-    _set_apple_music_allow_upscale(value, persist=True)
-
-
-def _set_apple_music_allow_upscale(value: bool, *, persist: bool) -> None:
-    global _APPLE_MUSIC_ALLOW_UPSCALE
-    _APPLE_MUSIC_ALLOW_UPSCALE = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("apple_music_allow_upscale", value, persist=True)
 
 
 def get_apple_music_allow_upscale() -> bool:
@@ -1038,53 +1269,39 @@ def get_apple_music_allow_upscale() -> bool:
 
 
 def set_coverart_enabled(value: bool) -> None:
-    _set_coverart_enabled(value, persist=True)
-
-
-def _set_coverart_enabled(value: bool, *, persist: bool) -> None:
-    global _COVERART_ENABLED
-    _COVERART_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("coverart_enabled", value, persist=True)
 
 
 def get_coverart_enabled() -> bool:
     return bool(_COVERART_ENABLED)
 
 
-def get_coverart_error() -> bool:
-    return bool(_COVERART_ERROR)
+def set_coverart_size(value: str) -> None:
+    _set_setting("coverart_size", value, persist=True)
 
 
-def set_coverart_error(value: bool) -> None:
-    global _COVERART_ERROR
-    _COVERART_ERROR = bool(value)
+def get_coverart_size() -> str:
+    return _COVERART_SIZE or ""
 
 
-def set_coverart_size(value: str) -> None:
-    _set_coverart_size(value, persist=True)
+def set_musicbrainz_enabled(value: bool) -> None:
+    _set_setting("musicbrainz_enabled", value, persist=True)
 
 
-def _set_coverart_size(value: str, *, persist: bool) -> None:
-    global _COVERART_SIZE
-    _COVERART_SIZE = value.strip().lower() if value else ""
-    if persist:
-        _persist_lidarr_settings()
+def get_musicbrainz_enabled() -> bool:
+    return bool(_MUSICBRAINZ_ENABLED)
 
 
-def get_coverart_size() -> str:
-    return _COVERART_SIZE or ""
+def set_wikipedia_enabled(value: bool) -> None:
+    _set_setting("wikipedia_enabled", value, persist=True)
 
 
-def set_refresh_resolve_names(value: bool) -> None:
-    _set_refresh_resolve_names(value, persist=True)
+def get_wikipedia_enabled() -> bool:
+    return bool(_WIKIPEDIA_ENABLED)
 
 
-def _set_refresh_resolve_names(value: bool, *, persist: bool) -> None:
-    global _REFRESH_RESOLVE_NAMES
-    _REFRESH_RESOLVE_NAMES = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+def set_refresh_resolve_names(value: bool) -> None:
+    _set_setting("refresh_resolve_names", value, persist=True)
 
 
 def get_refresh_resolve_names() -> bool:
@@ -1092,14 +1309,7 @@ def get_refresh_resolve_names() -> bool:
 
 
 def set_refresh_auto_refresh(value: bool) -> None:
-    _set_refresh_auto_refresh(value, persist=True)
-
-
-def _set_refresh_auto_refresh(value: bool, *, persist: bool) -> None:
-    global _REFRESH_AUTO_REFRESH
-    _REFRESH_AUTO_REFRESH = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("refresh_auto_refresh", value, persist=True)
 
 
 def get_refresh_auto_refresh() -> bool:
@@ -1107,85 +1317,59 @@ def get_refresh_auto_refresh() -> bool:
 
 
 def set_refresh_switch_release_mode(value: str) -> None:
-    _set_refresh_switch_release_mode(value, persist=True)
-
-
-def _set_refresh_switch_release_mode(value: str, *, persist: bool) -> None:
-    global _REFRESH_SWITCH_RELEASE_MODE
-    mode = str(value or "").strip().lower()
-    if mode not in {"auto", "off", "no-change"}:
-        mode = "no-change"
-    _REFRESH_SWITCH_RELEASE_MODE = mode
-    if persist:
-        _persist_lidarr_settings()
+    _set_setting("refresh_switch_release_mode", value, persist=True)
 
 
 def get_refresh_switch_release_mode() -> str:
-    mode = str(_REFRESH_SWITCH_RELEASE_MODE or "").strip().lower()
-    return mode if mode in {"auto", "off", "no-change"} else "no-change"
-
-
-def set_musicbrainz_enabled(value: bool) -> None:
-    _set_musicbrainz_enabled(value, persist=True)
+    return _REFRESH_SWITCH_RELEASE_MODE or "no-change"
 
 
-def _set_musicbrainz_enabled(value: bool, *, persist: bool) -> None:
-    global _MUSICBRAINZ_ENABLED
-    _MUSICBRAINZ_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+def get_fanart_error() -> bool:
+    return bool(_FANART_ERROR)
 
 
-def get_musicbrainz_enabled() -> bool:
-    return bool(_MUSICBRAINZ_ENABLED)
+def set_fanart_error(value: bool) -> None:
+    _set_setting("fanart_error", value, persist=False)
 
 
-def get_musicbrainz_error() -> bool:
-    return bool(_MUSICBRAINZ_ERROR)
+def get_tadb_error() -> bool:
+    return bool(_TADB_ERROR)
 
 
-def set_musicbrainz_error(value: bool) -> None:
-    global _MUSICBRAINZ_ERROR
-    _MUSICBRAINZ_ERROR = bool(value)
+def set_tadb_error(value: bool) -> None:
+    _set_setting("tadb_error", value, persist=False)
 
 
-def set_wikipedia_enabled(value: bool) -> None:
-    _set_wikipedia_enabled(value, persist=True)
+def get_lastfm_error() -> bool:
+    return bool(_LASTFM_ERROR)
 
 
-def _set_wikipedia_enabled(value: bool, *, persist: bool) -> None:
-    global _WIKIPEDIA_ENABLED
-    _WIKIPEDIA_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+def set_lastfm_error(value: bool) -> None:
+    _set_setting("lastfm_error", value, persist=False)
 
 
-def get_wikipedia_enabled() -> bool:
-    return bool(_WIKIPEDIA_ENABLED)
+def get_tidal_error() -> bool:
+    return bool(_TIDAL_ERROR)
 
 
-def get_wikipedia_error() -> bool:
-    return bool(_WIKIPEDIA_ERROR)
+def set_tidal_error(value: bool) -> None:
+    _set_setting("tidal_error", value, persist=False)
 
 
-def set_wikipedia_error(value: bool) -> None:
-    global _WIKIPEDIA_ERROR
-    _WIKIPEDIA_ERROR = bool(value)
+def get_discogs_error() -> bool:
+    return bool(_DISCOGS_ERROR)
 
 
-def set_plex_enabled(value: bool) -> None:
-    _set_plex_enabled(value, persist=True)
+def set_discogs_error(value: bool) -> None:
+    _set_setting("discogs_error", value, persist=False)
 
 
-def _set_plex_enabled(value: bool, *, persist: bool) -> None:
-    global _PLEX_ENABLED
-    _PLEX_ENABLED = bool(value)
-    if persist:
-        _persist_lidarr_settings()
+def get_apple_music_error() -> bool:
+    return bool(_APPLE_MUSIC_ERROR)
 
 
-def get_plex_enabled() -> bool:
-    return bool(_PLEX_ENABLED)
+def set_apple_music_error(value: bool) -> None:
+    _set_setting("apple_music_error", value, persist=False)
 
 
 def get_plex_error() -> bool:
@@ -1193,24 +1377,107 @@ def get_plex_error() -> bool:
 
 
 def set_plex_error(value: bool) -> None:
-    global _PLEX_ERROR
-    _PLEX_ERROR = bool(value)
+    _set_setting("plex_error", value, persist=False)
 
 
-def _is_localhost_url(value: str) -> bool:
-    lowered = value.strip().lower()
-    if not lowered:
-        return False
-    if not lowered.startswith("http://") and not lowered.startswith("https://"):
-        lowered = "http://" + lowered
-    try:
-        from urllib.parse import urlparse
+def get_coverart_error() -> bool:
+    return bool(_COVERART_ERROR)
 
-        parsed = urlparse(lowered)
-        host = (parsed.hostname or "").lower()
-    except Exception:
-        return False
-    return host in {"localhost", "127.0.0.1", "::1"}
+
+def set_coverart_error(value: bool) -> None:
+    _set_setting("coverart_error", value, persist=False)
+
+
+def get_musicbrainz_error() -> bool:
+    return bool(_MUSICBRAINZ_ERROR)
+
+
+def set_musicbrainz_error(value: bool) -> None:
+    _set_setting("musicbrainz_error", value, persist=False)
+
+
+def get_wikipedia_error() -> bool:
+    return bool(_WIKIPEDIA_ERROR)
+
+
+def set_wikipedia_error(value: bool) -> None:
+    _set_setting("wikipedia_error", value, persist=False)
+
+
+# Settings rendered into the root page, by placeholder kind. The escaped values
+# only change when a setting does, so they are rebuilt from a snapshot of the
+# backing globals rather than on every render.
+_SETTINGS_HTML_TEXT = (
+    "lidarr_base_url",
+    "lidarr_api_key",
+    "slskd_base_url",
+    "slskd_api_key",
+    "fanart_key",
+    "tadb_key",
+    "lastfm_key",
+    "lastfm_secret",
+    "tidal_client_id",
+    "tidal_client_secret",
+    "tidal_country_code",
+    "tidal_user",
+    "tidal_user_password",
+    "discogs_key",
+    "apple_music_max_image_size",
+    "coverart_size",
+)
+_SETTINGS_HTML_BOOL = (
+    "fanart_enabled",
+    "tadb_enabled",
+    "lastfm_enabled",
+    "tidal_enabled",
+    "discogs_enabled",
+    "discogs_mirror_enabled",
+    "apple_music_enabled",
+    "apple_music_allow_upscale",
+    "plex_enabled",
+    "coverart_enabled",
+    "musicbrainz_enabled",
+    "wikipedia_enabled",
+    "fanart_error",
+    "tadb_error",
+    "lastfm_error",
+    "tidal_error",
+    "discogs_error",
+    "apple_music_error",
+    "plex_error",
+    "coverart_error",
+    "musicbrainz_error",
+    "wikipedia_error",
+)
+_BOOL_HTML = ("false", "true")
+
+
+_SETTINGS_HTML_GLOBALS = tuple(
+    _SETTINGS_SCHEMA[name][0]
+    for name in _SETTINGS_HTML_TEXT + _SETTINGS_HTML_BOOL + ("refresh_resolve_names",)
+)
+_SETTINGS_HTML_CACHE: Optional[Tuple[tuple, Dict[str, str]]] = None
+
+
+def _settings_replacements() -> Dict[str, str]:
+    global _SETTINGS_HTML_CACHE
+    module_globals = globals()
+    state = tuple(module_globals[name] for name in _SETTINGS_HTML_GLOBALS)
+    cached = _SETTINGS_HTML_CACHE
+    if cached is not None and cached[0] == state:
+        return cached[1]
+    replacements = {}
+    for name in _SETTINGS_HTML_TEXT:
+        value = module_globals["get_" + name]()
+        replacements[f"__{name.upper()}__"] = _escape_html(value)
+    for name in _SETTINGS_HTML_BOOL:
+        value = module_globals["get_" + name]()
+        replacements[f"__{name.upper()}__"] = _BOOL_HTML[bool(value)]
+    replacements["__REFRESH_RESOLVE_NAMES__"] = (
+        "checked" if get_refresh_resolve_names() else ""
+    )
+    _SETTINGS_HTML_CACHE = (state, replacements)
+    return replacements
 
 
 def set_lidarr_client_ip(value: str) -> None:
@@ -1242,7 +1509,9 @@ def _postgres_cache_targets() -> Iterable[Tuple[str, object]]:
 
 
 async def _maybe_await(value: object) -> object:
-    if inspect.isawaitable(value):
+    # Cache backends return coroutines or plain values; anything with
+    # __await__ (coroutines, futures, tasks) is awaited.
+    if hasattr(type(value), "__await__"):
         return await value
     return value
 
@@ -1262,20 +1531,26 @@ async def _clear_all_cache_tables() -> dict:
     return {"cleared": cleared, "skipped": skipped}
 
 
+async def _expire_cache_table(name: str, cache: object) -> Tuple[str, bool]:
+    try:
+        pool = await _maybe_await(cache._get_pool())
+        async with pool.acquire() as conn:
+            await conn.execute(
+                f"UPDATE {cache._db_table} SET expires = current_timestamp;"
+            )
+    except Exception:
+        return name, False
+    return name, True
+
+
 async def _expire_all_cache_tables() -> dict:
-    expired = []
-    skipped = []
-    for name, cache in _postgres_cache_targets():
-        try:
-            pool = await _maybe_await(cache._get_pool())
-            async with pool.acquire() as conn:
-                await conn.execute(
-                    f"UPDATE {cache._db_table} SET expires = current_timestamp;"
-                )
-            expired.append(name)
-        except Exception:
-            skipped.append(name)
-    return {"expired": expired, "skipped": skipped}
+    results = await asyncio.gather(
+        *(_expire_cache_table(name, cache) for name, cache in _postgres_cache_targets())
+    )
+    return {
+        "expired": [name for name, ok in results if ok],
+        "skipped": [name for name, ok in results if not ok],
+    }
 
 
 def _format_uptime(seconds: float) -> str:
@@ -1292,102 +1567,195 @@ def _format_uptime(seconds: float) -> str:
     return f"{secs}s"
 
 
-def _format_replication_date(value: object) -> str:
-    if value is None:
-        return "unknown"
-    if isinstance(value, datetime):
-        dt = value
-    else:
-        raw = str(value).strip()
-        if not raw:
-            return "unknown"
-        try:
-            dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
-        except Exception:
-            return raw
+def _format_local_datetime(dt: datetime) -> str:
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=datetime.now().astimezone().tzinfo)
     dt_local = dt.astimezone()
-    date_part = dt_local.strftime("%Y-%m-%d")
-    time_part = dt_local.strftime("%I:%M %p").lstrip("0")
-    return f"{date_part} {time_part}"
+    hour = dt_local.hour % 12 or 12
+    ampm = "AM" if dt_local.hour < 12 else "PM"
+    return f"{dt_local:%Y-%m-%d} {hour}:{dt_local.minute:02d} {ampm}"
+
+
+@functools.lru_cache(maxsize=64)
+def _format_replication_date_text(raw: str) -> Tuple[str, bool]:
+    try:
+        dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except Exception:
+        return raw, False
+    return _format_local_datetime(dt), True
+
+
+def _format_replication_date_parts(value: object) -> Tuple[str, bool]:
+    # The flag is True when the label came from _format_local_datetime, whose
+    # output (digits, "-", ":", " ", AM/PM) never needs HTML escaping.
+    if value is None:
+        return "unknown", True
+    if isinstance(value, datetime):
+        return _format_local_datetime(value), True
+    raw = str(value).strip()
+    if not raw:
+        return "unknown", True
+    return _format_replication_date_text(raw)
+
+
+def _format_replication_date(value: object) -> str:
+    return _format_replication_date_parts(value)[0]
 
 
 def _format_replication_date_html(value: object) -> str:
-    label = _format_replication_date(value)
+    label, safe = _format_replication_date_parts(value)
+    if safe:
+        base, sep, ampm = label.rpartition(" ")
+        if sep and ampm in ("AM", "PM"):
+            return f'{base}&nbsp;<span class="ampm">{ampm}</span>'
+        return label
     if not label:
-        return html.escape(label)
+        return _escape_html(label)
     if label.lower() == "unknown":
-        return html.escape(label)
+        return _escape_html(label)
     parts = label.rsplit(" ", 1)
     if len(parts) != 2 or parts[1] not in {"AM", "PM"}:
-        return html.escape(label)
-    base = html.escape(parts[0])
-    ampm = html.escape(parts[1])
+        return _escape_html(label)
+    base = _escape_html(parts[0])
+    ampm = _escape_html(parts[1])
     return f'{base}&nbsp;<span class="ampm">{ampm}</span>'
 
 
+_SCHEDULE_TIME_RE = re.compile(r"\b([01]?\d|2[0-3]):([0-5]\d)(?:\s*([APap][Mm]))?\b")
+
+
 def _format_schedule_html(value: Optional[str]) -> str:
     if value is None:
-        return html.escape("unknown")
+        return _escape_html("unknown")
     text = str(value).strip()
     if not text:
-        return html.escape("unknown")
-    pattern = re.compile(r"\b([01]?\d|2[0-3]):([0-5]\d)(?:\s*([APap][Mm]))?\b")
+        return _escape_html("unknown")
+    if ":" not in text:
+        # No HH:MM token possible (e.g. "disabled", "weekly").
+        return _escape_html(text)
     parts = []
     last = 0
-    for match in pattern.finditer(text):
-        parts.append(html.escape(text[last : match.start()]))
+    for match in _SCHEDULE_TIME_RE.finditer(text):
+        parts.append(_escape_html(text[last : match.start()]))
         hour = int(match.group(1))
         minute = match.group(2)
         ampm = (match.group(3) or ("AM" if hour < 12 else "PM")).upper()
         hour12 = hour % 12 or 12
         parts.append(f'{hour12}:{minute}&nbsp;<span class="ampm">{ampm}</span>')
         last = match.end()
-    parts.append(html.escape(text[last:]))
+    parts.append(_escape_html(text[last:]))
     return "".join(parts)
 
 
-def _read_replication_status() -> Tuple[bool, str]:
-    status_path = Path(
-        os.getenv(
-            "LIMBO_REPLICATION_STATUS_FILE",
-            "/metadata/init-state/replication.pid",
-        )
-    )
-    if not status_path.exists():
-        return False, ""
-    started = ""
+def ensure_state_dir(path: Path) -> None:
+    if path in _ENSURED_DIRS:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS.add(path)
+
+
+def write_in_state_dir(directory: Path, write: Callable[[], object]) -> None:
+    ensure_state_dir(directory)
     try:
-        mtime = status_path.stat().st_mtime
-        started = _format_replication_date(
-            datetime.fromtimestamp(mtime, tz=timezone.utc)
-        )
-    except Exception:
-        started = ""
-    return True, started
+        write()
+    except FileNotFoundError:
+        # The directory went away (state volume removed or remounted);
+        # forget it, recreate it and try once more.
+        _ENSURED_DIRS.discard(directory)
+        ensure_state_dir(directory)
+        write()
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def _read_replication_status() -> Tuple[bool, str]:
+    global _REPLICATION_STATUS_CACHE
+    now = time.monotonic()
+    checked_at, running, started = _REPLICATION_STATUS_CACHE
+    if checked_at and now - checked_at < _REPLICATION_STATUS_TTL:
+        return running, started
+    status_stat = _stat_or_none(_REPLICATION_STATUS_FILE)
+    if status_stat is None:
+        running, started = False, ""
+    else:
+        running = True
+        try:
+            started = _format_replication_date(
+                datetime.fromtimestamp(status_stat.st_mtime, tz=timezone.utc)
+            )
+        except Exception:
+            started = ""
+    _REPLICATION_STATUS_CACHE = (now, running, started)
+    return running, started
+
+
+def _invalidate_replication_status() -> None:
+    global _REPLICATION_STATUS_CACHE, _REPLICATION_VIEW_CACHE
+    _REPLICATION_STATUS_CACHE = (0.0, False, "")
+    _REPLICATION_VIEW_CACHE = None
+
+
+async def _replication_status_data() -> object:
+    global _REPLICATION_VIEW_CACHE
+    use_remote, _start_url, status_url, header_pair = _replication_remote_config()
+    key = (use_remote, status_url)
+    now = time.monotonic()
+    cached = _REPLICATION_VIEW_CACHE
+    if (
+        cached is not None
+        and cached[1] == key
+        and now - cached[0] < _REPLICATION_STATUS_TTL
+    ):
+        return cached[2]
+    data = None
+    if use_remote:
+        data = await _fetch_replication_status_remote(status_url, header_pair)
+    if data is None:
+        running, started = _read_replication_status()
+        data = {"running": running}
+        if started:
+            data["started"] = started
+    _REPLICATION_VIEW_CACHE = (now, key, data)
+    return data
 
 
 def _read_replication_notify_state() -> Optional[dict]:
-    global _LAST_REPLICATION_NOTIFY
-    if _LAST_REPLICATION_NOTIFY is not None:
+    # Revalidated by mtime so a notify received by another worker shows up.
+    global _LAST_REPLICATION_NOTIFY, _LAST_REPLICATION_NOTIFY_MTIME
+    notify_stat = _stat_or_none(_REPLICATION_NOTIFY_FILE)
+    if notify_stat is None:
+        return _LAST_REPLICATION_NOTIFY
+    if (
+        _LAST_REPLICATION_NOTIFY is not None
+        and notify_stat.st_mtime_ns == _LAST_REPLICATION_NOTIFY_MTIME
+    ):
         return _LAST_REPLICATION_NOTIFY
     try:
-        data = json.loads(_REPLICATION_NOTIFY_FILE.read_text())
-        if isinstance(data, dict):
-            _LAST_REPLICATION_NOTIFY = data
-            return data
+        data = json.loads(_REPLICATION_NOTIFY_FILE.read_bytes())
     except Exception:
-        return None
-    return None
+        return _LAST_REPLICATION_NOTIFY
+    if not isinstance(data, dict):
+        return _LAST_REPLICATION_NOTIFY
+    _LAST_REPLICATION_NOTIFY = data
+    _LAST_REPLICATION_NOTIFY_MTIME = notify_stat.st_mtime_ns
+    return data
 
 
 def _write_replication_notify_state(payload: dict) -> None:
-    global _LAST_REPLICATION_NOTIFY
+    global _LAST_REPLICATION_NOTIFY, _LAST_REPLICATION_NOTIFY_MTIME
     try:
-        _REPLICATION_NOTIFY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        _REPLICATION_NOTIFY_FILE.write_text(json.dumps(payload))
+        text = json.dumps(payload)
+        write_in_state_dir(
+            _REPLICATION_NOTIFY_FILE.parent,
+            lambda: _REPLICATION_NOTIFY_FILE.write_text(text),
+        )
         _LAST_REPLICATION_NOTIFY = payload
+        _LAST_REPLICATION_NOTIFY_MTIME = _REPLICATION_NOTIFY_FILE.stat().st_mtime_ns
     except Exception:
         return
 
@@ -1404,13 +1772,21 @@ def _write_theme(theme: str) -> None:
     if theme not in {"dark", "light", "auto"}:
         return
     try:
-        _THEME_FILE.parent.mkdir(parents=True, exist_ok=True)
-        _THEME_FILE.write_text(theme)
+        write_in_state_dir(_THEME_FILE.parent, lambda: _THEME_FILE.write_text(theme))
     except Exception:
         return
 
 
+# Replication settings come from the container environment, which does not
+# change after startup; resolve them once.
+_REPL_REMOTE_CFG: Optional[Tuple[bool, str, str, str]] = None
+_REPL_AUTH_ENV: Optional[Tuple[str, str]] = None
+
+
 def _replication_remote_config() -> Tuple[bool, str, str, str]:
+    global _REPL_REMOTE_CFG
+    if _REPL_REMOTE_CFG is not None:
+        return _REPL_REMOTE_CFG
     use_remote = False
     base_url = os.getenv("LIMBO_REPLICATION_BASE_URL") or ""
     start_url = os.getenv("LIMBO_REPLICATION_URL") or ""
@@ -1437,18 +1813,25 @@ def _replication_remote_config() -> Tuple[bool, str, str, str]:
         or os.getenv("LIMBO_APIKEY")
         or ""
     )
-    return use_remote, start_url, status_url, (header + ":" + key if key else "")
+    _REPL_REMOTE_CFG = (
+        use_remote,
+        start_url,
+        status_url,
+        (header + ":" + key if key else ""),
+    )
+    return _REPL_REMOTE_CFG
 
 
 def _replication_auth_config(app_config: dict) -> Tuple[str, str]:
-    header = os.getenv("LIMBO_REPLICATION_HEADER", "") or "X-MBMS-Key"
-    key = (
-        os.getenv("LIMBO_REPLICATION_KEY")
-        or os.getenv("MBMS_ADMIN_KEY")
-        or app_config.get("LIMBO_APIKEY")
-        or ""
-    )
-    return header, key
+    global _REPL_AUTH_ENV
+    if _REPL_AUTH_ENV is None:
+        _REPL_AUTH_ENV = (
+            os.getenv("LIMBO_REPLICATION_HEADER", "") or "X-MBMS-Key",
+            os.getenv("LIMBO_REPLICATION_KEY") or os.getenv("MBMS_ADMIN_KEY") or "",
+        )
+    header, key = _REPL_AUTH_ENV
+    # The app config is read live since it can be swapped out at runtime.
+    return header, key or app_config.get("LIMBO_APIKEY") or ""
 
 
 async def _fetch_replication_status_remote(
@@ -1461,12 +1844,13 @@ async def _fetch_replication_status_remote(
         name, value = header_pair.split(":", 1)
         headers[name] = value
     try:
-        timeout = aiohttp.ClientTimeout(total=2)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(status_url, headers=headers) as resp:
-                if resp.status != 200:
-                    return None
-                return await resp.json()
+        session = await _get_http_session()
+        async with session.get(
+            status_url, headers=headers, timeout=aiohttp.ClientTimeout(total=2)
+        ) as resp:
+            if resp.status != 200:
+                return None
+            return await resp.json(loads=_json_loads)
     except Exception:
         return None
 
@@ -1479,12 +1863,13 @@ async def _fetch_lidarr_version(base_url: str, api_key: str) -> Optional[str]:
     url = base_url.rstrip("/") + "/api/v1/system/status"
     headers = {"X-Api-Key": api_key}
     try:
-        timeout = aiohttp.ClientTimeout(total=2)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    return None
-                data = await resp.json()
+        session = await _get_http_session()
+        async with session.get(
+            url, headers=headers, timeout=aiohttp.ClientTimeout(total=2)
+        ) as resp:
+            if resp.status != 200:
+                return None
+            data = await resp.json(loads=_json_loads)
     except Exception:
         return None
     for key in ("version", "appVersion", "packageVersion", "buildVersion"):
@@ -1494,6 +1879,24 @@ async def _fetch_lidarr_version(base_url: str, api_key: str) -> Optional[str]:
     return None
 
 
+_LIDARR_STATUS_CACHE: Optional[Tuple[float, Tuple[str, str], Optional[str]]] = None
+_LIDARR_STATUS_TTL = 60.0
+
+
+async def _fetch_lidarr_version_cached(base_url: str, api_key: str) -> Optional[str]:
+    # Keyed on the connection settings so edits on the settings page take
+    # effect on the next render rather than after the TTL.
+    global _LIDARR_STATUS_CACHE
+    key = (base_url, api_key)
+    now = time.monotonic()
+    cached = _LIDARR_STATUS_CACHE
+    if cached is not None and cached[1] == key and now - cached[0] < _LIDARR_STATUS_TTL:
+        return cached[2]
+    version = await _fetch_lidarr_version(base_url, api_key)
+    _LIDARR_STATUS_CACHE = (now, key, version)
+    return version
+
+
 def _env_first(*names: str) -> Optional[str]:
     for name in names:
         value = os.getenv(name)
@@ -1510,6 +1913,13 @@ def _env_any(*names: str) -> bool:
     return False
 
 
+def _fmt_info_value(value: object) -> str:
+    if value is None:
+        return "unknown"
+    value = str(value).strip()
+    return value if value else "unknown"
+
+
 def _format_replication_schedule() -> Optional[str]:
     enabled = _env_first("MUSICBRAINZ_REPLICATION_ENABLED")
     if enabled is not None and enabled.lower() in {"0", "false", "no", "off"}:
@@ -1567,61 +1977,71 @@ def _format_index_schedule() -> Optional[str]:
 
 
 def _read_last_lidarr_version() -> Optional[str]:
-    global _LAST_LIDARR_VERSION
+    global _LAST_LIDARR_VERSION, _LIDARR_VERSION_ON_DISK
     if _LAST_LIDARR_VERSION is not None:
         return _LAST_LIDARR_VERSION
     try:
         value = _LIDARR_VERSION_FILE.read_text().strip()
     except OSError:
         value = ""
-    _LAST_LIDARR_VERSION = value or None
+    _LAST_LIDARR_VERSION = _LIDARR_VERSION_ON_DISK = value or None
     return _LAST_LIDARR_VERSION
 
 
 def set_lidarr_version(value: Optional[str]) -> None:
     value = (value or "").strip()
     version = value or None
-    global _LAST_LIDARR_VERSION
+    global _LAST_LIDARR_VERSION, _LIDARR_VERSION_ON_DISK
     _LAST_LIDARR_VERSION = version
-    if not version:
+    if not version or version == _LIDARR_VERSION_ON_DISK:
         return
     try:
-        _LIDARR_VERSION_FILE.parent.mkdir(parents=True, exist_ok=True)
-        _LIDARR_VERSION_FILE.write_text(version + "\n")
+        write_in_state_dir(
+            _LIDARR_VERSION_FILE.parent,
+            lambda: _LIDARR_VERSION_FILE.write_text(version + "\n"),
+        )
     except OSError:
         return
+    _LIDARR_VERSION_ON_DISK = version
 
 
 def _read_last_plugin_version() -> Optional[str]:
-    global _LAST_PLUGIN_VERSION
+    global _LAST_PLUGIN_VERSION, _PLUGIN_VERSION_ON_DISK
     if _LAST_PLUGIN_VERSION is not None:
         return _LAST_PLUGIN_VERSION
     try:
         value = _PLUGIN_VERSION_FILE.read_text().strip()
     except OSError:
         value = ""
-    _LAST_PLUGIN_VERSION = value or None
+    _LAST_PLUGIN_VERSION = _PLUGIN_VERSION_ON_DISK = value or None
     return _LAST_PLUGIN_VERSION
 
 
 def set_plugin_version(value: Optional[str]) -> None:
     value = (value or "").strip()
     version = value or None
-    global _LAST_PLUGIN_VERSION
+    global _LAST_PLUGIN_VERSION, _PLUGIN_VERSION_ON_DISK
     _LAST_PLUGIN_VERSION = version
-    if not version:
+    if not version or version == _PLUGIN_VERSION_ON_DISK:
         return
     try:
-        _PLUGIN_VERSION_FILE.parent.mkdir(parents=True, exist_ok=True)
-        _PLUGIN_VERSION_FILE.write_text(version + "\n")
+        write_in_state_dir(
+            _PLUGIN_VERSION_FILE.parent,
+            lambda: _PLUGIN_VERSION_FILE.write_text(version + "\n"),
+        )
     except OSError:
         return
+    _PLUGIN_VERSION_ON_DISK = version
+
+
+_LIDARR_UA_RE = re.compile(r"\bLidarr/([0-9A-Za-z.\-]+)")
 
 
 def _capture_lidarr_version(user_agent: Optional[str]) -> None:
-    if not user_agent:
+    # Runs before every request; most user agents aren't Lidarr's.
+    if not user_agent or "Lidarr/" not in user_agent:
         return
-    match = re.search(r"\bLidarr/([0-9A-Za-z.\-]+)", user_agent)
+    match = _LIDARR_UA_RE.search(user_agent)
     if not match:
         return
     version = match.group(1)
@@ -1633,10 +2053,16 @@ def _capture_lidarr_version(user_agent: Optional[str]) -> None:
 
 def register_root_route() -> None:
     from lidarrmetadata import app as upstream_app
-    from quart import Response, request, send_file, jsonify
+    from lidarrmetadata import provider
+    from lidarrmetadata.app import no_cache
+    from quart import Response, request, jsonify
+    from lidarrmetadata.provider_capabilities import list_provider_capabilities
 
-    assets_dir = Path(__file__).resolve().parent / "assets"
     _load_lidarr_settings()
+    try:
+        _read_root_template()
+    except OSError:
+        pass
     limbo_api_key = (
         os.getenv("LIMBO_APIKEY")
         or upstream_app.app.config.get("LIMBO_APIKEY")
@@ -1646,67 +2072,76 @@ def register_root_route() -> None:
         upstream_app.app.config["LIMBO_APIKEY"] = limbo_api_key
         upstream_app.app.config["INVALIDATE_APIKEY"] = limbo_api_key
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/assets/limbo-icon.png":
-            break
-    else:
+    if upstream_app.app.config.get("LIMBO_ROOT_ROUTES_REGISTERED"):
+        return
+    # rule -> endpoint, so the "/" override below needs no second scan.
+    existing_rules = {
+        rule.rule: rule.endpoint for rule in upstream_app.app.url_map.iter_rules()
+    }
+
+    def _asset_response(name: str, mimetype: str) -> "Response":
+        try:
+            body, etag = _read_static_asset(name)
+        except OSError:
+            return Response("Not Found", status=404)
+        cache_control = _ASSET_CACHE_CONTROL
+        if name == "root.css" and request.args.get("v"):
+            # Versioned URLs change whenever the stylesheet does.
+            cache_control = "public, max-age=31536000, immutable"
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(b"", status=304, headers=headers)
+        return Response(body, mimetype=mimetype, headers=headers)
+
+    if "/assets/limbo-icon.png" not in existing_rules:
 
         @upstream_app.app.route("/assets/limbo-icon.png", methods=["GET"])
         async def _limbo_icon():
-            return await send_file(assets_dir / "limbo-icon.png", mimetype="image/png")
+            return _asset_response("limbo-icon.png", "image/png")
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/assets/limbo-settings.svg":
-            break
-    else:
+    if "/assets/limbo-settings.svg" not in existing_rules:
 
         @upstream_app.app.route("/assets/limbo-settings.svg", methods=["GET"])
         async def _limbo_settings_icon():
-            return await send_file(
-                assets_dir / "limbo-settings.svg", mimetype="image/svg+xml"
-            )
+            return _asset_response("limbo-settings.svg", "image/svg+xml")
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/assets/limbo-dark.svg":
-            break
-    else:
+    if "/assets/limbo-dark.svg" not in existing_rules:
 
         @upstream_app.app.route("/assets/limbo-dark.svg", methods=["GET"])
         async def _limbo_dark_icon():
-            return await send_file(
-                assets_dir / "limbo-dark.svg", mimetype="image/svg+xml"
-            )
+            return _asset_response("limbo-dark.svg", "image/svg+xml")
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/assets/limbo-light.svg":
-            break
-    else:
+    if "/assets/limbo-light.svg" not in existing_rules:
 
         @upstream_app.app.route("/assets/limbo-light.svg", methods=["GET"])
         async def _limbo_light_icon():
-            return await send_file(
-                assets_dir / "limbo-light.svg", mimetype="image/svg+xml"
-            )
+            return _asset_response("limbo-light.svg", "image/svg+xml")
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/assets/limbo-tall-arrow.svg":
-            break
-    else:
+    if "/assets/limbo-tall-arrow.svg" not in existing_rules:
 
         @upstream_app.app.route("/assets/limbo-tall-arrow.svg", methods=["GET"])
         async def _limbo_tall_arrow():
-            return await send_file(
-                assets_dir / "limbo-tall-arrow.svg", mimetype="image/svg+xml"
-            )
+            return _asset_response("limbo-tall-arrow.svg", "image/svg+xml")
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/assets/root.css":
-            break
-    else:
+    if "/assets/root.css" not in existing_rules:
 
         @upstream_app.app.route("/assets/root.css", methods=["GET"])
         async def _limbo_root_css():
-            return await send_file(assets_dir / "root.css", mimetype="text/css")
+            return _asset_response("root.css", "text/css")
+
+    if not upstream_app.app.config.get("LIMBO_HTTP_SESSION_CLEANUP"):
+        upstream_app.app.config["LIMBO_HTTP_SESSION_CLEANUP"] = True
+
+        @upstream_app.app.before_serving
+        async def _limbo_prime_release_versions():
+            for owner, repo in _RELEASE_REPOS:
+                _cached_release_version(owner, repo)
+
+        @upstream_app.app.after_serving
+        async def _limbo_close_http_sessions():
+            await _close_github_session()
+            await _close_http_session()
 
     if not upstream_app.app.config.get("LIMBO_CAPTURE_LIDARR_VERSION"):
         upstream_app.app.config["LIMBO_CAPTURE_LIDARR_VERSION"] = True
@@ -1715,10 +2150,7 @@ def register_root_route() -> None:
         async def _limbo_capture_lidarr_version():
             _capture_lidarr_version(request.headers.get("User-Agent"))
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/cache/clear":
-            break
-    else:
+    if "/cache/clear" not in existing_rules:
 
         @upstream_app.app.route("/cache/clear", methods=["POST"])
         async def _limbo_cache_clear():
@@ -1729,10 +2161,7 @@ def register_root_route() -> None:
             result = await _clear_all_cache_tables()
             return jsonify(result)
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/cache/expire":
-            break
-    else:
+    if "/cache/expire" not in existing_rules:
 
         @upstream_app.app.route("/cache/expire", methods=["POST"])
         async def _limbo_cache_expire():
@@ -1743,10 +2172,7 @@ def register_root_route() -> None:
             result = await _expire_all_cache_tables()
             return jsonify(result)
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/replication/start":
-            break
-    else:
+    if "/replication/start" not in existing_rules:
 
         @upstream_app.app.route("/replication/start", methods=["POST"])
         async def _limbo_replication_start():
@@ -1772,31 +2198,37 @@ def register_root_route() -> None:
                     name, value = header_pair.split(":", 1)
                     headers[name] = value
                 try:
-                    timeout = aiohttp.ClientTimeout(total=4)
-                    async with aiohttp.ClientSession(timeout=timeout) as session:
-                        async with session.post(start_url, headers=headers) as resp:
-                            data = await resp.text()
-                            if resp.status >= 400:
-                                return (
-                                    jsonify({"ok": False, "error": data}),
-                                    resp.status,
-                                )
-                            return jsonify({"ok": True, "remote": True})
+                    session = await _get_http_session()
+                    async with session.post(
+                        start_url,
+                        headers=headers,
+                        timeout=aiohttp.ClientTimeout(total=4),
+                    ) as resp:
+                        data = await resp.text()
+                        if resp.status >= 400:
+                            return (
+                                jsonify({"ok": False, "error": data}),
+                                resp.status,
+                            )
+                        _invalidate_replication_status()
+                        return jsonify({"ok": True, "remote": True})
                 except Exception as exc:
                     return jsonify({"ok": False, "error": str(exc)}), 500
 
             script_path = os.getenv("LIMBO_REPLICATION_SCRIPT", "/admin/replicate-now")
             script = Path(script_path)
-            if not script.exists() and not script_path.endswith(".sh"):
+            script_stat = _stat_or_none(script)
+            if script_stat is None and not script_path.endswith(".sh"):
                 candidate = Path(script_path + ".sh")
-                if candidate.exists():
-                    script = candidate
-            if not script.exists():
+                candidate_stat = _stat_or_none(candidate)
+                if candidate_stat is not None:
+                    script, script_stat = candidate, candidate_stat
+            if script_stat is None:
                 return (
                     jsonify({"ok": False, "error": "Replication script not found."}),
                     404,
                 )
-            if not script.is_file():
+            if not stat.S_ISREG(script_stat.st_mode):
                 return (
                     jsonify(
                         {"ok": False, "error": "Replication script is not a file."}
@@ -1805,43 +2237,27 @@ def register_root_route() -> None:
                 )
 
             try:
+                import subprocess
+
                 subprocess.Popen(["/bin/bash", str(script)], cwd=str(script.parent))
             except Exception as exc:
                 return jsonify({"ok": False, "error": str(exc)}), 500
+            _invalidate_replication_status()
 
             return jsonify({"ok": True, "script": str(script)})
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/replication/status":
-            break
-    else:
+    if "/replication/status" not in existing_rules:
 
         @upstream_app.app.route("/replication/status", methods=["GET"])
         async def _limbo_replication_status():
-            use_remote, _start_url, status_url, header_pair = (
-                _replication_remote_config()
-            )
-            if use_remote:
-                data = await _fetch_replication_status_remote(status_url, header_pair)
-                if data is not None:
-                    notify = _read_replication_notify_state()
-                    if notify:
-                        data = dict(data)
-                        data["last"] = notify
-                    return jsonify(data)
-            running, started = _read_replication_status()
-            payload = {"running": running}
-            if started:
-                payload["started"] = started
+            data = await _replication_status_data()
             notify = _read_replication_notify_state()
             if notify:
-                payload["last"] = notify
-            return jsonify(payload)
+                data = dict(data)
+                data["last"] = notify
+            return jsonify(data)
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/replication/notify":
-            break
-    else:
+    if "/replication/notify" not in existing_rules:
 
         @upstream_app.app.route("/replication/notify", methods=["POST"])
         async def _limbo_replication_notify():
@@ -1862,10 +2278,7 @@ def register_root_route() -> None:
             upstream_app.app.logger.info("Replication notify received: %s", payload)
             return jsonify({"ok": True})
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/theme":
-            break
-    else:
+    if "/theme" not in existing_rules:
 
         @upstream_app.app.route("/theme", methods=["GET", "POST"])
         async def _limbo_theme():
@@ -1883,64 +2296,83 @@ def register_root_route() -> None:
             _write_theme(theme)
             return jsonify({"ok": True, "theme": theme})
 
+    # Env-derived values that are fixed for the life of the process; formatted
+    # and escaped here rather than on every render.
+    static_info = {
+        "mbms_replication_schedule": _fmt_info_value(_format_replication_schedule()),
+        "mbms_index_schedule": _fmt_info_value(_format_index_schedule()),
+        "metadata_version": _fmt_info_value(lidarrmetadata.__version__),
+        "branch": _fmt_info_value(os.getenv("GIT_BRANCH")),
+        "commit": _fmt_info_value(os.getenv("COMMIT_HASH")),
+    }
+    static_safe = {key: _escape_html(val) for key, val in static_info.items()}
+    replication_schedule_html = _format_schedule_html(
+        static_info["mbms_replication_schedule"]
+    )
+    index_schedule_html = _format_schedule_html(static_info["mbms_index_schedule"])
+    static_replacements = {
+        "__DEBUG_UI_CLASS__": "debug-ui"
+        if _is_truthy(os.getenv("LIMBO_DEBUG_UI") or os.getenv("DEBUG"))
+        else "",
+        "__CHANNEL_CLASS__": _limbo_channel_class(),
+        "__MBMS_REPLICATION_SCHEDULE__": static_safe["mbms_replication_schedule"],
+        "__MBMS_INDEX_SCHEDULE__": static_safe["mbms_index_schedule"],
+        "__METADATA_VERSION__": static_safe["metadata_version"],
+        "__MBMS_URL__": _escape_html("https://github.com/HVR88/MBMS_PLUS"),
+        "__WIKIPEDIA_UI_URL__": _escape_html("https://www.wikipedia.org"),
+        "__PROVIDER_CAPABILITIES__": json.dumps(list_provider_capabilities()),
+    }
+    lm_pill_href = _escape_html("https://github.com/HVR88/Limbo_Bridge")
+
     async def _limbo_root_route():
-        replication_date = None
-        try:
-            vintage_providers = provider.get_providers_implementing(
-                provider.DataVintageMixin
-            )
-            if vintage_providers:
-                replication_date = await _maybe_await(
-                    vintage_providers[0].data_vintage()
+        if _DEV_ASSETS:
+            _reload_asset_caches()
+
+        async def _read_replication_date() -> object:
+            try:
+                vintage_providers = provider.get_providers_implementing(
+                    provider.DataVintageMixin
                 )
-        except Exception:
-            replication_date = None
+                if vintage_providers:
+                    return await _maybe_await(vintage_providers[0].data_vintage())
+            except Exception:
+                return None
+            return None
 
         lidarr_version_label = "Lidarr (Last Seen)"
         lidarr_version = _read_last_lidarr_version()
         lidarr_base_url = get_lidarr_base_url()
         lidarr_api_key = get_lidarr_api_key()
-        if lidarr_base_url and lidarr_api_key:
-            fetched_version = await _fetch_lidarr_version(
-                lidarr_base_url, lidarr_api_key
-            )
-            if fetched_version:
-                lidarr_version_label = "Lidarr"
-                lidarr_version = fetched_version
-                set_lidarr_version(fetched_version)
-
-        def fmt(value: object) -> str:
-            if value is None:
-                return "unknown"
-            value = str(value).strip()
-            return value if value else "unknown"
+        # The remote lookups are independent; run them side by side so a slow
+        # Lidarr or MBMS admin endpoint doesn't stack its timeout on the other.
+        replication_date, fetched_version, status_data = await asyncio.gather(
+            _read_replication_date(),
+            _fetch_lidarr_version_cached(lidarr_base_url, lidarr_api_key)
+            if lidarr_base_url and lidarr_api_key
+            else _maybe_await(None),
+            _replication_status_data(),
+        )
+        if fetched_version:
+            lidarr_version_label = "Lidarr"
+            lidarr_version = fetched_version
+            set_lidarr_version(fetched_version)
 
-        replication_schedule = _format_replication_schedule()
-        index_schedule = _format_index_schedule()
         info = {
-            "version": fmt(_read_full_limbo_version()),
-            "plugin_version": fmt(_read_last_plugin_version()),
-            "mbms_plus_version": fmt(_read_mbms_plus_version()),
-            "mbms_replication_schedule": fmt(replication_schedule),
-            "mbms_index_schedule": fmt(index_schedule),
-            "lidarr_version": fmt(lidarr_version),
+            "version": _fmt_info_value(_read_full_limbo_version()),
+            "plugin_version": _fmt_info_value(_read_last_plugin_version()),
+            "mbms_plus_version": _fmt_info_value(_read_mbms_plus_version()),
+            "lidarr_version": _fmt_info_value(lidarr_version),
             "lidarr_version_label": lidarr_version_label,
-            "metadata_version": fmt(lidarrmetadata.__version__),
-            "branch": fmt(os.getenv("GIT_BRANCH")),
-            "commit": fmt(os.getenv("COMMIT_HASH")),
             "replication_date": _format_replication_date(replication_date),
             "uptime": _format_uptime(time.time() - _START_TIME),
         }
+        safe = {key: _escape_html(val) for key, val in info.items()}
+        info.update(static_info)
+        safe.update(static_safe)
         replication_date_html = _format_replication_date_html(replication_date)
-        replication_schedule_html = _format_schedule_html(
-            info["mbms_replication_schedule"]
-        )
-        index_schedule_html = _format_schedule_html(info["mbms_index_schedule"])
         theme_value = _read_theme()
         try:
             from lidarrmetadata import release_filters
-            from lidarrmetadata.provider_capabilities import list_provider_capabilities
-
             exclude = release_filters.get_runtime_media_exclude() or []
             include = release_filters.get_runtime_media_include() or []
             keep_only = release_filters.get_runtime_media_keep_only()
@@ -1955,7 +2387,6 @@ def register_root_route() -> None:
             }
         except Exception:
             config = {"enabled": False}
-        safe = {key: html.escape(val) for key, val in info.items()}
         base_path = (upstream_app.app.config.get("ROOT_PATH") or "").rstrip("/")
         if base_path and not base_path.startswith("/"):
             base_path = "/" + base_path
@@ -1976,26 +2407,9 @@ def register_root_route() -> None:
             limbo_url = limbo_host_url
         elif limbo_mode == "auto-referrer":
             limbo_url = limbo_referrer_effective
-        version_url = f"{base_path}/version" if base_path else "/version"
-        cache_clear_url = f"{base_path}/cache/clear" if base_path else "/cache/clear"
-        cache_expire_url = f"{base_path}/cache/expire" if base_path else "/cache/expire"
-        replication_start_url = (
-            f"{base_path}/replication/start" if base_path else "/replication/start"
-        )
-        replication_status_url = (
-            f"{base_path}/replication/status" if base_path else "/replication/status"
-        )
-        icon_url = (
-            f"{base_path}/assets/limbo-icon.png"
-            if base_path
-            else "/assets/limbo-icon.png"
-        )
-        lm_repo_url = "https://github.com/HVR88/Limbo_Bridge"
-        mbms_url = "https://github.com/HVR88/MBMS_PLUS"
-        musicbrainz_ui_url = (
-            f"{base_path}/musicbrainz" if base_path else "/musicbrainz"
+        route_urls = _route_url_replacements(
+            base_path, upstream_app.app.config.get("LIMBO_APIKEY") or ""
         )
-        wikipedia_ui_url = "https://www.wikipedia.org"
 
         def fmt_config_value(value: object, *, empty_label: str = "none") -> str:
             if value is None:
@@ -2009,48 +2423,27 @@ def register_root_route() -> None:
             text = str(value).strip()
             return text if text else empty_label
 
-        media_formats_url = (
-            "https://github.com/HVR88/Docs-Extras/blob/master/docs/Media-Formats.md"
-        )
-        exclude_label = "Filtered"
-        include_label = "Include Filtered"
-        media_type_link = '<a class="config-link" href="{}" target="_blank" rel="noopener">Media type</a>'.format(
-            html.escape(media_formats_url)
-        )
         config_menu_svg = _read_inline_svg("limbo-arrows-updn.svg")
-        enabled_value = fmt_config_value(config.get("enabled")).upper()
-        enabled_checked = "true" if config.get("enabled") else "false"
+        config_menu_button = _config_menu_button_html()
         config_rows = [
             (
-                f"<span data-filter-label-enabled>{media_type_link} filtering enabled</span>"
-                f'<span data-filter-label-disabled style="display:none">{media_type_link} filtering disabled</span>',
-                f'<label class="config-toggle">'
-                f'<input type="checkbox" data-config-enabled {"checked" if enabled_checked == "true" else ""} />'
-                '<span class="config-toggle__track" aria-hidden="true">'
-                '<span class="config-toggle__thumb"></span>'
-                "</span>"
-                "</label>",
+                _FILTER_ENABLED_LABEL_HTML,
+                _CONFIG_TOGGLE_HTML[bool(config.get("enabled"))],
             ),
             (
                 "Limit the number of releases",
-                f'<span class="config-value-text">{html.escape(fmt_config_value(config.get("keep_only_media_count"), empty_label="no limit"))}</span>'
-                '<button class="config-action" type="button" aria-label="More" data-config-menu>'
-                f'<span class="config-action__inner">{config_menu_svg}</span>'
-                "</button>",
+                f'<span class="config-value-text">{_escape_html(fmt_config_value(config.get("keep_only_media_count"), empty_label="no limit"))}</span>'
+                + config_menu_button,
             ),
             (
                 "(Optional) Preferred media type when limiting",
-                f'<span class="config-value-text">{html.escape(fmt_config_value(config.get("prefer"), empty_label="any"))}</span>'
-                '<button class="config-action" type="button" aria-label="More" data-config-menu>'
-                f'<span class="config-action__inner">{config_menu_svg}</span>'
-                "</button>",
+                f'<span class="config-value-text">{_escape_html(fmt_config_value(config.get("prefer"), empty_label="any"))}</span>'
+                + config_menu_button,
             ),
             (
-                exclude_label,
-                f'<span class="config-value-text">{html.escape(fmt_config_value(config.get("exclude_media_formats")))}</span>'
-                '<button class="config-action" type="button" aria-label="More" data-config-menu>'
-                f'<span class="config-action__inner">{config_menu_svg}</span>'
-                "</button>",
+                "Filtered",
+                f'<span class="config-value-text">{_escape_html(fmt_config_value(config.get("exclude_media_formats")))}</span>'
+                + config_menu_button,
             ),
             (
                 "&nbsp;",
@@ -2069,36 +2462,22 @@ def register_root_route() -> None:
             ]
         )
 
-        template_path = assets_dir / "root.html"
-        template = template_path.read_text(encoding="utf-8")
-        css_version = html.escape(info["version"])
-        css_nonce = secrets.token_hex(3)
-        template = template.replace(
-            'href="/assets/root.css"',
-            f'href="/assets/root.css?v={css_version}-{css_nonce}"',
-        )
-        use_remote, _start_url, status_url, header_pair = _replication_remote_config()
+        template = _read_root_template()
+        css_version = _escape_html(info["version"])
+        css_buster = _css_buster()
         replication_running = False
         replication_started = ""
-        if use_remote:
-            status_data = await _fetch_replication_status_remote(
-                status_url, header_pair
-            )
-            if status_data and isinstance(status_data, dict):
-                replication_running = bool(status_data.get("running"))
-                replication_started = str(status_data.get("started") or "")
-        if not use_remote:
-            replication_running, replication_started = _read_replication_status()
+        if isinstance(status_data, dict):
+            replication_running = bool(status_data.get("running"))
+            replication_started = str(status_data.get("started") or "")
         replication_button_label = "Running" if replication_running else "Start"
-        replication_pill_class = (
-            "pill has-action wide-action" if replication_running else "pill has-action"
-        )
+        replication_pill_class = _REPLICATION_PILL_CLASS[replication_running]
         replication_button_attrs = []
         if replication_running:
             replication_button_attrs.append('data-replication-running="true"')
         if replication_started:
             replication_button_attrs.append(
-                f'data-replication-started="{html.escape(replication_started)}"'
+                f'data-replication-started="{_escape_html(replication_started)}"'
             )
         replication_button_attr_text = (
             " " + " ".join(replication_button_attrs) if replication_button_attrs else ""
@@ -2112,82 +2491,21 @@ def register_root_route() -> None:
         thick_arrow_rt_svg = _read_inline_svg("limbo-arrow-thick-rt.svg")
 
         replacements = {
-            "__ICON_URL__": html.escape(icon_url),
-            "__DEBUG_UI_CLASS__": "debug-ui"
-            if _is_truthy(os.getenv("LIMBO_DEBUG_UI") or os.getenv("DEBUG"))
-            else "",
-            "__CHANNEL_CLASS__": _limbo_channel_class(),
             "__LM_VERSION__": safe["version"],
             "__LM_PLUGIN_VERSION__": safe["plugin_version"],
             "__MBMS_PLUS_VERSION__": safe["mbms_plus_version"],
             "__LIDARR_VERSION__": safe["lidarr_version"],
             "__LIDARR_VERSION_LABEL__": safe["lidarr_version_label"],
-            "__LIDARR_BASE_URL__": html.escape(get_lidarr_base_url()),
-            "__LIDARR_API_KEY__": html.escape(get_lidarr_api_key()),
-            "__SLSKD_BASE_URL__": html.escape(get_slskd_base_url()),
-            "__SLSKD_API_KEY__": html.escape(get_slskd_api_key()),
-            "__LIMBO_URL__": html.escape(limbo_url),
-            "__LIMBO_URL_REFERRER__": html.escape(limbo_referrer_effective),
-            "__LIMBO_URL_HOST__": html.escape(limbo_host_url),
-            "__LIMBO_URL_MODE__": html.escape(limbo_mode),
-            "__LIMBO_URL_CUSTOM__": html.escape(limbo_custom_url),
-            "__FANART_KEY__": html.escape(get_fanart_key()),
-            "__TADB_KEY__": html.escape(get_tadb_key()),
-            "__LASTFM_KEY__": html.escape(get_lastfm_key()),
-            "__LASTFM_SECRET__": html.escape(get_lastfm_secret()),
-            "__TIDAL_CLIENT_ID__": html.escape(get_tidal_client_id()),
-            "__TIDAL_CLIENT_SECRET__": html.escape(get_tidal_client_secret()),
-            "__TIDAL_COUNTRY_CODE__": html.escape(get_tidal_country_code()),
-            "__TIDAL_USER__": html.escape(get_tidal_user()),
-            "__TIDAL_USER_PASSWORD__": html.escape(get_tidal_user_password()),
-            "__DISCOGS_KEY__": html.escape(get_discogs_key()),
-            "__APPLE_MUSIC_MAX_IMAGE_SIZE__": html.escape(
-                get_apple_music_max_image_size()
-            ),
-            "__FANART_ENABLED__": "true" if get_fanart_enabled() else "false",
-            "__TADB_ENABLED__": "true" if get_tadb_enabled() else "false",
-            "__LASTFM_ENABLED__": "true" if get_lastfm_enabled() else "false",
-            "__TIDAL_ENABLED__": "true" if get_tidal_enabled() else "false",
-            "__DISCOGS_ENABLED__": "true" if get_discogs_enabled() else "false",
-            "__DISCOGS_MIRROR_ENABLED__": "true"
-            if get_discogs_mirror_enabled()
-            else "false",
-            "__APPLE_MUSIC_ENABLED__": "true" if get_apple_music_enabled() else "false",
-            "__PLEX_ENABLED__": "true" if get_plex_enabled() else "false",
-            "__COVERART_ENABLED__": "true" if get_coverart_enabled() else "false",
-            "__COVERART_SIZE__": html.escape(get_coverart_size()),
-            "__MUSICBRAINZ_ENABLED__": "true" if get_musicbrainz_enabled() else "false",
-            "__WIKIPEDIA_ENABLED__": "true" if get_wikipedia_enabled() else "false",
-            "__FANART_ERROR__": "true" if get_fanart_error() else "false",
-            "__TADB_ERROR__": "true" if get_tadb_error() else "false",
-            "__LASTFM_ERROR__": "true" if get_lastfm_error() else "false",
-            "__TIDAL_ERROR__": "true" if get_tidal_error() else "false",
-            "__DISCOGS_ERROR__": "true" if get_discogs_error() else "false",
-            "__APPLE_MUSIC_ERROR__": "true" if get_apple_music_error() else "false",
-            "__PLEX_ERROR__": "true" if get_plex_error() else "false",
-            "__COVERART_ERROR__": "true" if get_coverart_error() else "false",
-            "__MUSICBRAINZ_ERROR__": "true" if get_musicbrainz_error() else "false",
-            "__WIKIPEDIA_ERROR__": "true" if get_wikipedia_error() else "false",
-            "__MBMS_REPLICATION_SCHEDULE__": safe["mbms_replication_schedule"],
-            "__MBMS_INDEX_SCHEDULE__": safe["mbms_index_schedule"],
-            "__METADATA_VERSION__": safe["metadata_version"],
-            "__REFRESH_RESOLVE_NAMES__": "checked" if get_refresh_resolve_names() else "",
+            "__LIMBO_URL__": _escape_html(limbo_url),
+            "__LIMBO_URL_REFERRER__": _escape_html(limbo_referrer_effective),
+            "__LIMBO_URL_HOST__": _escape_html(limbo_host_url),
+            "__LIMBO_URL_MODE__": _escape_html(limbo_mode),
+            "__LIMBO_URL_CUSTOM__": _escape_html(limbo_custom_url),
             "__REPLICATION_DATE__": safe["replication_date"],
             "__REPLICATION_DATE_HTML__": replication_date_html,
-            "__THEME__": html.escape(theme_value),
+            "__THEME__": _escape_html(theme_value),
             "__UPTIME__": safe["uptime"],
-            "__VERSION_URL__": html.escape(version_url),
-            "__CACHE_CLEAR_URL__": html.escape(cache_clear_url),
-            "__CACHE_EXPIRE_URL__": html.escape(cache_expire_url),
-            "__REPLICATION_START_URL__": html.escape(replication_start_url),
-            "__REPLICATION_STATUS_URL__": html.escape(replication_status_url),
-            "__MUSICBRAINZ_UI_URL__": html.escape(musicbrainz_ui_url),
-            "__WIKIPEDIA_UI_URL__": html.escape(wikipedia_ui_url),
             "__REPLICATION_PILL_CLASS__": replication_pill_class,
-            "__LIMBO_APIKEY__": html.escape(
-                upstream_app.app.config.get("LIMBO_APIKEY") or ""
-            ),
-            "__MBMS_URL__": html.escape(mbms_url),
             "__SETTINGS_ICON__": settings_svg,
             "__THEME_ICON_DARK__": theme_dark_svg,
             "__THEME_ICON_LIGHT__": theme_light_svg,
@@ -2196,8 +2514,10 @@ def register_root_route() -> None:
             "__THICK_ARROW_RT_ICON__": json.dumps(thick_arrow_rt_svg),
             "__CONFIG_MENU_ICON__": config_menu_svg,
             "__CONFIG_HTML__": config_html,
-            "__PROVIDER_CAPABILITIES__": json.dumps(list_provider_capabilities()),
         }
+        replacements.update(route_urls)
+        replacements.update(static_replacements)
+        replacements.update(_settings_replacements())
         lidarr_ui_url = get_lidarr_base_url()
         if "last seen" in lidarr_version_label.lower():
             lidarr_pill_class = "pill"
@@ -2209,7 +2529,7 @@ def register_root_route() -> None:
             lidarr_arrow = ""
         else:
             lidarr_pill_class = "pill has-action"
-            lidarr_pill_href = html.escape(lidarr_ui_url)
+            lidarr_pill_href = _escape_html(lidarr_ui_url)
             lidarr_arrow = (
                 f'<span class="pill-arrow" aria-hidden="true">{tall_arrow_svg}</span>'
             )
@@ -2217,10 +2537,8 @@ def register_root_route() -> None:
             f"{lidarr_ui_url.rstrip('/')}/system/plugins" if lidarr_ui_url else ""
         )
 
-        lm_latest, mbms_latest = await asyncio.gather(
-            _fetch_latest_release_version("HVR88", "Limbo_Bridge"),
-            _fetch_latest_release_version("HVR88", "MBMS_PLUS"),
-        )
+        lm_latest = _cached_release_version("HVR88", "Limbo_Bridge")
+        mbms_latest = _cached_release_version("HVR88", "MBMS_PLUS")
 
         lm_update = (
             lm_latest
@@ -2238,19 +2556,7 @@ def register_root_route() -> None:
             else None
         )
 
-        def _format_version_value(
-            current: str, update: Optional[str]
-        ) -> Tuple[str, bool]:
-            if not update:
-                return current, False
-            return (
-                f'<span class="version-current">{current}</span>'
-                f'<span class="version-update">&rarr; NEW {html.escape(update)}</span>',
-                True,
-            )
-
         lm_pill_class = "pill has-action"
-        lm_pill_href = html.escape(lm_repo_url)
 
         if plugin_update:
             replacements["__PLUGIN_PILL_CLASS__"] = "pill"
@@ -2259,115 +2565,89 @@ def register_root_route() -> None:
             replacements["__PLUGIN_PILL_CLASS__"] = "pill"
             replacements["__LM_PLUGIN_LABEL__"] = "Limbo Plugin Version"
 
-        mbms_version_value, mbms_has_update = _format_version_value(
-            safe["mbms_plus_version"], mbms_update
-        )
-        mbms_value_class = "value has-update" if mbms_has_update else "value"
-        mbms_pills = "\n".join(
-            [
-                '          <button type="button" class="pill" disabled>',
-                '            <div class="label">&nbsp;</div>',
-                '            <div class="value">&nbsp;</div>',
-                "          </button>",
-                '          <button type="button" class="pill" data-pill-href="" data-modal-open="schedule-indexer">',
-                '            <div class="label">DB Indexing Schedule</div>',
-                f'            <div class="value">{index_schedule_html}</div>',
-                f'            <span class="pill-arrow" aria-hidden="true">{tall_arrow_svg}</span>',
-                "          </button>",
-                '          <button type="button" class="pill" data-pill-href="" data-modal-open="schedule-replication">',
-                '            <div class="label">DB Replication Schedule</div>',
-                f'            <div class="value">{replication_schedule_html}</div>',
-                f"            {lidarr_arrow}",
-                "          </button>",
-            ]
+        replacements["__MBMS_PILLS__"] = _MBMS_PILLS_FMT.format_map(
+            {
+                "index_schedule": index_schedule_html,
+                "replication_schedule": replication_schedule_html,
+                "arrow": tall_arrow_svg,
+                "lidarr_arrow": lidarr_arrow,
+            }
         )
-        replacements["__MBMS_PILLS__"] = mbms_pills
-
-        if lm_pill_href:
-            lm_pill_tag_open = '<button type="button" class="{}"'.format(lm_pill_class)
-            lm_pill_tag_open += ' data-pill-href="{}">'.format(lm_pill_href)
-        else:
-            lm_pill_tag_open = '<button type="button" class="{}" disabled>'.format(
-                lm_pill_class
-            )
-        mbms_version_label = html.escape(safe["mbms_plus_version"])
-        bridge_version_label = html.escape(safe["version"])
+        mbms_version_label = _escape_html(safe["mbms_plus_version"])
+        bridge_version_label = _escape_html(safe["version"])
         mbms_title = (
-            f"New: {html.escape(mbms_update)}" if mbms_update else ""
+            f"New: {_escape_html(mbms_update)}" if mbms_update else ""
         )
         bridge_title = (
-            f"New: {html.escape(lm_update)}" if lm_update else ""
+            f"New: {_escape_html(lm_update)}" if lm_update else ""
         )
-        mbms_class = "version-part"
-        if mbms_update:
-            mbms_class += " version-part--update"
-        bridge_class = "version-part"
-        if lm_update:
-            bridge_class += " version-part--update"
+        mbms_class = _VERSION_PART_CLASS[bool(mbms_update)]
+        bridge_class = _VERSION_PART_CLASS[bool(lm_update)]
         mbms_title_attr = f' title="{mbms_title}"' if mbms_title else ""
         bridge_title_attr = f' title="{bridge_title}"' if bridge_title else ""
-        lm_version_value = (
-            f'<span class="{mbms_class}"'
-            f"{mbms_title_attr}>"
-            f"{mbms_version_label}</span> "
-            f'(<span class="{bridge_class}"'
-            f"{bridge_title_attr}>"
-            f"{bridge_version_label}</span>)"
+        lm_version_value = _LM_VERSION_FMT.format_map(
+            {
+                "mbms_class": mbms_class,
+                "mbms_title": mbms_title_attr,
+                "mbms_label": mbms_version_label,
+                "bridge_class": bridge_class,
+                "bridge_title": bridge_title_attr,
+                "bridge_label": bridge_version_label,
+            }
         )
-        lm_value_class = "value"
-        lm_pill_html = "\n".join(
-            [
-                f"          {lm_pill_tag_open}",
-                '            <div class="label">LIMBO (BRIDGE/WEBUI)</div>',
-                f'            <div class="{lm_value_class}">{lm_version_value}</div>',
-                f'            <span class="pill-arrow" aria-hidden="true">{tall_arrow_svg}</span>',
-                "          </button>",
-            ]
+        lm_pill_tag_open = _PILL_TAG_OPEN_FMT[bool(lm_pill_href)].format_map(
+            {"cls": lm_pill_class, "href": lm_pill_href}
+        )
+        replacements["__LM_PILL_HTML__"] = _LM_PILL_FMT.format_map(
+            {
+                "tag_open": lm_pill_tag_open,
+                "value": lm_version_value,
+                "arrow": tall_arrow_svg,
+            }
         )
-        replacements["__LM_PILL_HTML__"] = lm_pill_html
 
-        if lidarr_pill_href:
-            lidarr_pill_tag_open = '<button type="button" class="{}"'.format(
-                lidarr_pill_class
-            )
-            lidarr_pill_tag_open += ' data-pill-href="{}">'.format(lidarr_pill_href)
-        else:
-            lidarr_pill_tag_open = '<button type="button" class="{}" disabled>'.format(
-                lidarr_pill_class
-            )
-        lidarr_pill_html = "\n".join(
-            [
-                f"          {lidarr_pill_tag_open}",
-                f'            <div class="label" data-lidarr-pill-label>{safe["lidarr_version_label"]}</div>',
-                f'            <div class="value" data-lidarr-pill-value>{safe["lidarr_version"]}</div>',
-                f'            <span class="pill-arrow" aria-hidden="true">{tall_arrow_svg}</span>',
-                "          </button>",
-            ]
+        lidarr_pill_tag_open = _PILL_TAG_OPEN_FMT[bool(lidarr_pill_href)].format_map(
+            {"cls": lidarr_pill_class, "href": lidarr_pill_href}
+        )
+        replacements["__LIDARR_PILL_HTML__"] = _LIDARR_PILL_FMT.format_map(
+            {
+                "tag_open": lidarr_pill_tag_open,
+                "label": safe["lidarr_version_label"],
+                "value": safe["lidarr_version"],
+                "arrow": tall_arrow_svg,
+            }
         )
-        replacements["__LIDARR_PILL_HTML__"] = lidarr_pill_html
 
-        replication_pill_html = "\n".join(
-            [
-                '          <button type="button" class="{}" data-replication-pill data-pill-href="{}">'.format(
-                    replication_pill_class, html.escape(replication_start_url)
-                ),
-                '            <div class="label">Last Replication</div>',
-                f'            <div class="value replication-date" data-replication-value>{replication_date_html}</div>',
-                f'            <span class="pill-arrow" aria-hidden="true">{tall_arrow_svg}</span>',
-                "          </button>",
-            ]
+        replacements["__REPLICATION_PILL_HTML__"] = _REPLICATION_PILL_FMT.format_map(
+            {
+                "cls": replication_pill_class,
+                "href": route_urls["__REPLICATION_START_URL__"],
+                "value": replication_date_html,
+                "arrow": tall_arrow_svg,
+            }
+        )
+        replacements['href="/assets/root.css"'] = (
+            f'href="/assets/root.css?v={css_version}-{css_buster}"'
+        )
+        # Unchanged replacements hit the _render_page memo, so a revisit costs
+        # a dict lookup and, with a matching ETag, no body at all.
+        body, etag = _render_page(template, tuple(replacements.items()))
+        headers = {"ETag": etag, "Cache-Control": _PAGE_CACHE_CONTROL}
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(b"", status=304, headers=headers)
+        return Response(
+            body,
+            content_type="text/html; charset=utf-8",
+            headers=headers,
         )
-        replacements["__REPLICATION_PILL_HTML__"] = replication_pill_html
-        page = template
-        for key, value in replacements.items():
-            page = page.replace(key, value)
-        return Response(page, mimetype="text/html")
 
     wrapped = no_cache(_limbo_root_route)
+    upstream_app.app.config["LIMBO_ROOT_ROUTES_REGISTERED"] = True
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/":
-            upstream_app.app.view_functions[rule.endpoint] = wrapped
-            return
+    root_endpoint = existing_rules.get("/")
+    if root_endpoint is not None:
+        upstream_app.app.view_functions[root_endpoint] = wrapped
+        return
 
     upstream_app.app.route("/", methods=["GET"])(wrapped)
@@ -1,7 +1,12 @@
+import functools
+import json
 import os
 from pathlib import Path
 
 
+# The version only changes with a new image, so it is read once per process;
+# _read_version.cache_clear() forces a re-read.
+@functools.lru_cache(maxsize=1)
 def _read_version() -> str:
     env_version = os.environ.get("LIMBO_VERSION")
     if env_version:
@@ -14,14 +19,22 @@ def _read_version() -> str:
         return "unknown"
 
 
+@functools.lru_cache(maxsize=1)
+def _version_body(version: str) -> bytes:
+    return json.dumps({"version": version}, separators=(",", ":")).encode("utf-8")
+
+
 def register_version_route() -> None:
     from lidarrmetadata import app as upstream_app
-    from quart import jsonify
 
-    for rule in upstream_app.app.url_map.iter_rules():
-        if rule.rule == "/version":
-            return
+    existing_rules = {rule.rule for rule in upstream_app.app.url_map.iter_rules()}
+    if "/version" in existing_rules:
+        return
 
     @upstream_app.app.route("/version", methods=["GET"])
     async def _limbo_version_route():
-        return jsonify({"version": _read_version()})
+        return (
+            _version_body(_read_version()),
+            200,
+            {"Content-Type": "application/json"},
+        )
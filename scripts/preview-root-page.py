@@ -6,8 +6,20 @@ import subprocess
 import sys
 import json
 import re
+import shutil
 from pathlib import Path
 
+_SVG_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+# Same placeholder set as the server-side render in root_patch.
+_PLACEHOLDER_RE = re.compile(r'__[A-Z][A-Z0-9_]*__|href="/assets/root\.css"')
+
+
+def _inline_svg(content: str) -> str:
+    content = content.replace(
+        '<?xml version="1.0" encoding="UTF-8" standalone="no"?>', ""
+    )
+    return _SVG_COMMENT_RE.sub("", content).strip()
+
 
 def build_preview_html() -> str:
     root = Path(__file__).resolve().parents[1]
@@ -15,23 +27,18 @@ def build_preview_html() -> str:
         root / "overlay" / "bridge" / "lidarrmetadata" / "assets" / "root.html"
     )
     template = template_path.read_text(encoding="utf-8")
-    template = template.replace(
-        'href="/assets/root.css"', 'href="assets/root.css?v=preview-nocache"'
-    )
     svg_dir = template_path.parent
+    # One pass over the asset directory; missing icons render as "".
+    svgs = {
+        path.name: _inline_svg(path.read_text(encoding="utf-8"))
+        for path in svg_dir.glob("*.svg")
+    }
 
     def read_svg(name: str) -> str:
-        try:
-            content = (svg_dir / name).read_text(encoding="utf-8")
-        except Exception:
-            return ""
-        content = content.replace(
-            '<?xml version="1.0" encoding="UTF-8" standalone="no"?>', ""
-        )
-        content = re.sub(r"<!--.*?-->", "", content, flags=re.DOTALL)
-        return content.strip()
+        return svgs.get(name, "")
 
     menu_icon = read_svg("limbo-arrows-updn.svg")
+    tall_arrow = read_svg("limbo-tall-arrow.svg")
     config_html = "\n".join(
         [
             f'          <div class="config-row"><div class="config-label"><span data-filter-label-enabled>Media type filtering enabled</span><span data-filter-label-disabled style="display:none">Media type filtering disabled</span></div><div class="config-value"><label class="config-toggle"><input type="checkbox" data-config-enabled checked /><span class="config-toggle__track" aria-hidden="true"><span class="config-toggle__thumb"></span></span></label></div></div>',
@@ -51,12 +58,12 @@ def build_preview_html() -> str:
             '          <button type="button" class="pill" data-pill-href="" data-modal-open="schedule-indexer">',
             '            <div class="label">DB Indexing Schedule</div>',
             '            <div class="value">daily @ 3:00&nbsp;<span class="ampm">AM</span></div>',
-            f"            <span class=\"pill-arrow\" aria-hidden=\"true\">{read_svg('limbo-tall-arrow.svg')}</span>",
+            f'            <span class="pill-arrow" aria-hidden="true">{tall_arrow}</span>',
             "          </button>",
             '          <button type="button" class="pill" data-pill-href="" data-modal-open="schedule-replication">',
             '            <div class="label">DB Replication Schedule</div>',
             '            <div class="value">hourly @ :15</div>',
-            f"            <span class=\"pill-arrow\" aria-hidden=\"true\">{read_svg('limbo-tall-arrow.svg')}</span>",
+            f'            <span class="pill-arrow" aria-hidden="true">{tall_arrow}</span>',
             "          </button>",
         ]
     )
@@ -73,7 +80,7 @@ def build_preview_html() -> str:
                 '          <button type="button" class="pill has-action" data-pill-href="https://github.com/HVR88/Limbo_Bridge">',
                 '            <div class="label">LIMBO (BRIDGE/WEBUI)</div>',
                 '            <div class="value has-update"><span class="version-current">1.9.7.10</span><span class="version-update">&rarr; NEW 1.9.7.12</span></div>',
-                f"            <span class=\"pill-arrow\" aria-hidden=\"true\">{read_svg('limbo-tall-arrow.svg')}</span>",
+                f'            <span class="pill-arrow" aria-hidden="true">{tall_arrow}</span>',
                 "          </button>",
             ]
         ),
@@ -90,7 +97,7 @@ def build_preview_html() -> str:
                 '          <button type="button" class="pill has-action" data-replication-pill data-pill-href="/replication/start">',
                 '            <div class="label">Last Replication</div>',
                 '            <div class="value replication-date" data-replication-value>2026-02-20 12:23&nbsp;<span class="ampm">AM</span></div>',
-                f"            <span class=\"pill-arrow\" aria-hidden=\"true\">{read_svg('limbo-tall-arrow.svg')}</span>",
+                f'            <span class="pill-arrow" aria-hidden="true">{tall_arrow}</span>',
                 "          </button>",
             ]
         ),
@@ -149,7 +156,7 @@ def build_preview_html() -> str:
         "__THEME_ICON_DARK__": read_svg("limbo-dark.svg"),
         "__THEME_ICON_LIGHT__": read_svg("limbo-light.svg"),
         "__THEME_ICON_AUTO__": read_svg("limbo-auto.svg"),
-        "__TALL_ARROW_ICON__": read_svg("limbo-tall-arrow.svg"),
+        "__TALL_ARROW_ICON__": tall_arrow,
         "__CONFIG_MENU_ICON__": read_svg("limbo-arrows-updn.svg"),
         "__THICK_ARROW_RT_ICON__": json.dumps(read_svg("limbo-arrow-thick-rt.svg")),
         "__PROVIDER_CAPABILITIES__": json.dumps(
@@ -193,12 +200,12 @@ def build_preview_html() -> str:
         "__MBMS_URL__": "https://github.com/HVR88/MBMS_PLUS",
         "__CONFIG_HTML__": config_html,
         "__MBMS_PILLS__": mbms_pills,
+        'href="/assets/root.css"': 'href="assets/root.css?v=preview-nocache"',
     }
 
-    for key, value in replacements.items():
-        template = template.replace(key, value)
-
-    return template
+    return _PLACEHOLDER_RE.sub(
+        lambda match: replacements.get(match.group(0), match.group(0)), template
+    )
 
 
 def main() -> int:
@@ -233,17 +240,13 @@ def main() -> int:
     if css_source.exists():
         assets_dir = output_path.parent / "assets"
         assets_dir.mkdir(parents=True, exist_ok=True)
-        (assets_dir / "root.css").write_text(
-            css_source.read_text(encoding="utf-8"), encoding="utf-8"
-        )
+        shutil.copyfile(css_source, assets_dir / "root.css")
         svg_source_dir = css_source.parent
         for svg_path in svg_source_dir.glob("*.svg"):
-            (assets_dir / svg_path.name).write_text(
-                svg_path.read_text(encoding="utf-8"), encoding="utf-8"
-            )
+            shutil.copyfile(svg_path, assets_dir / svg_path.name)
         icon_path = css_source.parent / "limbo-icon.png"
         if icon_path.exists():
-            (assets_dir / icon_path.name).write_bytes(icon_path.read_bytes())
+            shutil.copyfile(icon_path, assets_dir / icon_path.name)
     print(output_path)
     if args.open:
         try: